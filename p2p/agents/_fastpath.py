@@ -0,0 +1,76 @@
+"""Inner searches over SoA book columns (prices/qtys ndarrays, best price first).
+
+The prefix walks are compiled with Numba when the optional `opt` extra is installed and
+otherwise run as plain Python with identical results (no fastmath: both paths evaluate the
+same float expressions). Lookups that only need the sort order use `np.searchsorted`.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    HAVE_NUMBA = False
+
+
+def band_search(prices: np.ndarray, q_price: float, band: float, is_buy: bool) -> int:
+    """Index of the first offer crossing `q_price` within relative `band` of it, or -1.
+
+    The window is buy -> [q(1-band), q], sell -> [q, q(1+band)]. On a best-first side (asks
+    ascending when `is_buy`, bids descending otherwise) the first offer in it is found in
+    O(log M): binary-search the near edge, then check the offer there against the far edge.
+    """
+    n = prices.size
+    if is_buy:
+        lo = q_price * (1.0 - band)
+        i = int(np.searchsorted(prices, lo, side="left"))  # first ask >= lo
+        return i if i < n and prices[i] <= q_price else -1
+    hi = q_price * (1.0 + band)
+    # first bid <= hi == number of bids above hi (searched on the ascending reversed view)
+    i = n - int(np.searchsorted(prices[::-1], hi, side="right"))
+    return i if i < n and prices[i] >= q_price else -1
+
+
+def _greedy_fill(
+    prices: np.ndarray, qtys: np.ndarray, q_price: float, q_qty: float, is_buy: bool
+) -> float:
+    """Quantity available to a marketable limit at `q_price`, accumulated best-first
+    until `q_qty` is covered (may overshoot it by the last maker's size)."""
+    total = 0.0
+    for i in range(prices.size):
+        p = prices[i]
+        if p > q_price if is_buy else p < q_price:
+            break  # sorted: no further crosses
+        total += qtys[i]
+        if total >= q_qty:
+            break
+    return total
+
+
+def _k_greedy_fill(
+    prices: np.ndarray, qtys: np.ndarray, k: int, q_price: float, q_qty: float, is_buy: bool
+) -> tuple[float, int]:
+    """Fill up to `q_qty` from feasible offers among the first `k`.
+
+    Returns (filled_qty, offers_seen); scanning stops once the quantity is covered.
+    """
+    filled = 0.0
+    seen = 0
+    for i in range(min(k, prices.size)):
+        seen += 1
+        p = prices[i]
+        if p <= q_price if is_buy else p >= q_price:
+            take = min(q_qty - filled, qtys[i])
+            filled += max(0.0, take)
+            if filled >= q_qty:
+                filled = q_qty
+                break
+    return filled, seen
+
+
+greedy_fill = njit(cache=True)(_greedy_fill) if HAVE_NUMBA else _greedy_fill
+k_greedy_fill = njit(cache=True)(_k_greedy_fill) if HAVE_NUMBA else _k_greedy_fill
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Any
+import numpy as np
 
-from .prosumer import Prosumer
+from .prosumer import Decision, Prosumer
 
 
 class NoRegretLearner(Prosumer):
@@ -14,98 +13,108 @@ class NoRegretLearner(Prosumer):
     - Reward proxy: 1.0 if the chosen quote would lead to a feasible crossing
       with the current book snapshot, else 0.0. This approximates acceptance probability.
     - Decision: if feasible, accepts the best maker among feasible; otherwise posts.
+    - Value update: sample mean for an arm's first `ema_after` pulls, then a constant-step
+      EMA with `alpha` (tracks non-stationary books, no division per update).
     """
 
     epsilon: float = 0.1
     arms_cents: list[float] | None = None  # e.g., [-2,-1,0,1,2]
-
-    # internal state
-    _counts: list[int] | None = None
-    _values: list[float] | None = None
+    alpha: float = 0.05
+    ema_after: int = 20
+
+    # internal state: fixed-length arrays, (re)allocated per instance by _ensure_arms
+    _arms: np.ndarray = np.zeros(0, dtype=np.float64)
+    _counts: np.ndarray = np.zeros(0, dtype=np.int32)
+    _values: np.ndarray = np.zeros(0, dtype=np.float64)
+    # index of the first arm with the highest value, maintained by _update_arm
+    _best_idx: int = 0
+    # exploration randomness for the whole horizon: uniforms vs epsilon, random arm indices
+    _arm_rng: np.random.Generator | None = None
+    _rand_u: np.ndarray = np.zeros(0, dtype=np.float64)
+    _rand_k: np.ndarray = np.zeros(0, dtype=np.int64)
 
     def _ensure_arms(self) -> None:
         if self.arms_cents is None:
             self.arms_cents = [-2.0, -1.0, 0.0, 1.0, 2.0]
-        if (
-            self._counts is None
-            or self._values is None
-            or len(self._counts) != len(self.arms_cents)
-        ):
-            self._counts = [0 for _ in self.arms_cents]
-            self._values = [0.0 for _ in self.arms_cents]
-
-    def _choose_arm(self) -> int:
+        if self._arms.size != len(self.arms_cents):
+            k = len(self.arms_cents)
+            self._arms = np.asarray(self.arms_cents, dtype=np.float64)
+            self._counts = np.zeros(k, dtype=np.int32)
+            self._values = np.zeros(k, dtype=np.float64)
+            self._best_idx = 0
+            # One vectorized draw per horizon from a dedicated PCG64 stream, so exploration
+            # neither costs an RNG call per decision nor perturbs the quote-noise stream.
+            if self._arm_rng is None:
+                self._arm_rng = np.random.default_rng(self._seed)
+            horizon = self._net.size
+            self._rand_u = self._arm_rng.random(horizon)
+            self._rand_k = self._arm_rng.integers(0, k, size=horizon)
+
+    def _choose_arm(self, t: int) -> int:
         self._ensure_arms()
-        assert self._counts is not None and self._values is not None and self.arms_cents is not None
-        # epsilon-greedy
-        if self._rng.random() < self.epsilon:
-            return self._rng.randrange(len(self.arms_cents))
-        # exploit
-        best_idx = 0
-        best_val = self._values[0]
-        for i, v in enumerate(self._values):
-            if v > best_val:
-                best_val = v
-                best_idx = i
-        return best_idx
+        # epsilon-greedy; exploit picks the first arm with the highest value
+        if self._rand_u[t] < self.epsilon:
+            return int(self._rand_k[t])
+        return self._best_idx
 
     def _update_arm(self, idx: int, reward: float) -> None:
-        assert self._counts is not None and self._values is not None
-        self._counts[idx] += 1
-        n = self._counts[idx]
-        val = self._values[idx]
-        self._values[idx] = val + (reward - val) / n
+        old = self._values[idx]
+        n = self._counts[idx] = self._counts[idx] + 1
+        new = old + ((reward - old) / n if n < self.ema_after else self.alpha * (reward - old))
+        self._values[idx] = new
+        best = self._best_idx
+        if idx == best:
+            # Only a drop of the incumbent can hand the lead to another arm
+            if new < old:
+                self._best_idx = int(self._values.argmax())
+        elif new > self._values[best] or (new == self._values[best] and idx < best):
+            self._best_idx = idx
 
     def _feasible(
-        self, side: str, q_price: float, opp: Iterable[Any]
-    ) -> tuple[bool, float, Any | None]:
-        """Return (is_feasible, best_price, best_order)."""
-        best_price = None
-        best_order = None
-        for o in opp:
-            price = getattr(o, "price_cperkwh", None) or o[0]
-            if side == "buy":
-                if price <= q_price and (best_price is None or price < best_price):
-                    best_price, best_order = price, o
-            else:
-                if price >= q_price and (best_price is None or price > best_price):
-                    best_price, best_order = price, o
-        return (
-            best_price is not None,
-            float(best_price) if best_price is not None else 0.0,
-            best_order,
-        )
-
-    def decide(self, order_book_snapshot: dict, t: int) -> dict[str, Any]:
+        self, is_buy: bool, q_price: float, prices: np.ndarray
+    ) -> tuple[bool, float, int]:
+        """Return (is_feasible, best_price, best_index) over the opposite-side prices.
+
+        The side is best-first, so the head is the best maker and the only one to check.
+        """
+        if prices.size == 0:
+            return False, 0.0, -1
+        price = float(prices[0])
+        if price > q_price if is_buy else price < q_price:
+            return False, 0.0, -1
+        return True, price, 0
+
+    def decide(self, order_book_snapshot: dict, t: int) -> Decision:
+        # Quiet interval: bail out before touching the quote RNG or the snapshot
+        if not self.has_quote(t):
+            return Decision("none", learners_steps=0)
         quote = self.make_quote(t)
         if quote is None:
-            return {"type": "none", "learners_steps": 0}
+            return Decision("none", learners_steps=0)
         anchor_price, q_qty, side = quote
 
         # Choose an arm (price offset) for this decision
         self._ensure_arms()
-        idx = self._choose_arm()
-        offset = self.arms_cents[idx] if self.arms_cents is not None else 0.0
+        idx = self._choose_arm(t)
+        offset = float(self._arms[idx])
         # Apply offset: buys push up; sells push down
-        q_price = max(0.0, anchor_price + (offset if side == "buy" else -offset))
-
-        bids = order_book_snapshot.get("bids", [])
-        asks = order_book_snapshot.get("asks", [])
-        opp = asks if side == "buy" else bids
+        is_buy = side == "buy"
+        q_price = max(0.0, anchor_price + (offset if is_buy else -offset))
 
-        feasible, best_price, best_order = self._feasible(side, q_price, opp)
+        prices, qtys, oids = self._opposite_columns(order_book_snapshot, side)
+        feasible, best_price, best = self._feasible(is_buy, q_price, prices)
         reward = 1.0 if feasible else 0.0
         self._update_arm(idx, reward)
 
-        if feasible and best_order is not None:
-            oid = getattr(best_order, "order_id", None) or best_order[3]
-            qty = min(q_qty, getattr(best_order, "qty_kwh", None) or best_order[1])
-            return {
-                "type": "accept",
-                "order_id": oid,
-                "qty_kwh": qty,
-                "price": best_price,
-                "side": side,
-                "learners_steps": 1,
-            }
-        return {"type": "post", "learners_steps": 1}
+        if feasible:
+            qty = min(q_qty, float(qtys[best]))
+            return Decision(
+                "accept",
+                order_id=int(oids[best]),
+                qty_kwh=qty,
+                price=best_price,
+                side=side,
+                learners_steps=1,
+            )
+        return Decision("post", learners_steps=1)
+
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
 from typing import Any, Literal
 
-from .prosumer import Prosumer
+from ._fastpath import greedy_fill
+from .prosumer import Decision, Prosumer
 
 Mode = Literal["single", "greedy"]
 
@@ -24,70 +24,46 @@ class Optimizer(Prosumer):
         if mode is not None:
             self.mode = mode
 
-    def _extract_opposite(self, snapshot: Any, side: str) -> Iterable[Any]:
-        if isinstance(snapshot, dict):
-            bids = snapshot.get("bids", [])
-            asks = snapshot.get("asks", [])
-        elif isinstance(snapshot, tuple) and len(snapshot) == 2:
-            bids, asks = snapshot
-        else:
-            bids, asks = [], []
-        return asks if side == "buy" else bids
-
-    def decide(self, order_book_snapshot: Any, t: int) -> dict[str, Any]:
+    def decide(self, order_book_snapshot: Any, t: int) -> Decision:
+        # Quiet interval: bail out before touching the quote RNG or the snapshot
+        if not self.has_quote(t):
+            return Decision("none", solver_calls=0)
         quote = self.make_quote(t)
         if quote is None:
-            return {"type": "none", "solver_calls": 0}
+            return Decision("none", solver_calls=0)
         q_price, q_qty, side = quote
-        opp = list(self._extract_opposite(order_book_snapshot, side))
-        scanned = len(opp)
-
-        # Feasible makers under the quote limit price
-        feas = []
-        for o in opp:
-            # Extract fields robustly: treat 0/0.0 as valid values, only fall back on None
-            p = getattr(o, "price_cperkwh", None)
-            price = p if p is not None else o[0]
-            oid_attr = getattr(o, "order_id", None)
-            oid = oid_attr if oid_attr is not None else o[3]
-            q = getattr(o, "qty_kwh", None)
-            qty = q if q is not None else o[1]
-            if (side == "buy" and price <= q_price) or (side == "sell" and price >= q_price):
-                feas.append((price, oid, qty))
-
-        if not feas:
-            return {"type": "post", "solver_calls": scanned}
+        prices, qtys, oids = self._opposite_columns(order_book_snapshot, side)
+        is_buy = side == "buy"
+        scanned = int(prices.size)
+        if scanned == 0:
+            return Decision("post", solver_calls=scanned)
 
+        # The book is in price-time priority, so the first maker is the best-priced one
+        # and the feasible makers form a prefix. solver_calls still reports the size of the
+        # opposite side (the optimizer's search space), as before.
         if self.mode == "single":
-            # Choose best single maker price: min for buyer, max for seller
-            if side == "buy":
-                price, oid, oqty = min(feas, key=lambda x: x[0])
-            else:
-                price, oid, oqty = max(feas, key=lambda x: x[0])
-            qty = min(q_qty, oqty)
-            return {
-                "type": "accept",
-                "order_id": oid,
-                "qty_kwh": qty,
-                "price": price,
-                "solver_calls": scanned,
-                "side": side,
-            }
+            price = float(prices[0])
+            if price > q_price if is_buy else price < q_price:
+                return Decision("post", solver_calls=scanned)
+            qty = min(q_qty, float(qtys[0]))
+            return Decision(
+                "accept",
+                order_id=int(oids[0]),
+                qty_kwh=qty,
+                price=price,
+                solver_calls=scanned,
+                side=side,
+            )
 
         # Greedy multi-fill: submit a marketable limit at the quote price; fill up to q_qty
-        total_feasible = 0.0
-        for _, _, oqty in feas:
-            total_feasible += float(oqty)
-            if total_feasible >= q_qty:
-                break
-        qty = min(q_qty, total_feasible)
+        qty = min(q_qty, greedy_fill(prices, qtys, q_price, q_qty, is_buy))
         if qty <= 0:
-            return {"type": "post", "solver_calls": scanned}
-        return {
-            "type": "accept",
+            return Decision("post", solver_calls=scanned)
+        return Decision(
+            "accept",
             # Side determines taker; price is the agent's quote (marketable limit)
-            "qty_kwh": qty,
-            "price": q_price,
-            "solver_calls": scanned,
-            "side": side,
-        }
+            qty_kwh=qty,
+            price=q_price,
+            solver_calls=scanned,
+            side=side,
+        )
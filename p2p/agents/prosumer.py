@@ -1,17 +1,79 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import random
-from dataclasses import dataclass, field
-from typing import Any, Literal
+from dataclasses import dataclass, field, fields
+from typing import Any, Literal, cast
+
+import numpy as np
 
 from ..env.devices import Battery
 from ..env.params import DEFAULTS
 from ..env.profiles import household_load_profile_kwh, pv_profile_kwh, sample_pv_nameplate_kw
+from ..market.order_book import OrderColumns, order_columns
 
 Side = Literal["buy", "sell"]
 
+# Net positions below this (kWh) produce no quote
+QUOTE_EPS_KWH = 1e-6
+
+
+def _stable_seed(agent_id: str) -> int:
+    """Default RNG seed derived from the agent id; unlike hash(), not salted per process."""
+    return int.from_bytes(hashlib.blake2s(agent_id.encode(), digest_size=4).digest(), "little")
+
+
+@functools.lru_cache(maxsize=1024)
+def _default_profiles(
+    seed: int, step_min: int
+) -> tuple[tuple[float, ...], tuple[float, ...], tuple[Any, ...]]:
+    """Load and PV profiles drawn from a fresh `random.Random(seed)`, plus the RNG state after
+    the draws, so a cached agent continues its stream exactly where generation left off."""
+    rng = random.Random(seed)  # noqa: S311
+    load = household_load_profile_kwh(step_min=step_min, rng=rng)
+    nameplate = sample_pv_nameplate_kw(rng=rng)
+    pv = pv_profile_kwh(nameplate_kw=nameplate, step_min=step_min, rng=rng)
+    return tuple(load), tuple(pv), rng.getstate()
+
+
+@dataclass(slots=True)
+class Decision:
+    """Planned action returned by `decide()`.
 
-@dataclass
+    Fields an agent does not set stay None (or 0 for the counters), mirroring the keys the
+    old result dicts omitted, so loggers and the call-auction side fallback see the same
+    values as before.
+    """
+
+    type: str
+    order_id: int | None = None
+    qty_kwh: float | None = None
+    price: float | None = None
+    side: Side | None = None
+    offers_seen: int = 0
+    solver_calls: int = 0
+    learners_steps: int = 0
+
+    @classmethod
+    def of(cls, act: Any) -> Decision | None:
+        """Coerce a decide() result (Decision or legacy dict) to a Decision; else None."""
+        if isinstance(act, Decision):
+            return act
+        if isinstance(act, dict) and "type" in act:
+            return cls(**{f.name: act[f.name] for f in fields(cls) if f.name in act})
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Legacy dict form (unset optional fields omitted)."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+
+@dataclass(slots=True)
 class Prosumer:
     """Base prosumer with simple environment wiring (Phase 2).
 
@@ -43,11 +105,26 @@ class Prosumer:
     sell_discount_cents: float | None = None
     quote_sigma_cents: float = 0.5
 
+    # Set up in __post_init__: RNG stream and per-interval quote arrays
+    _seed: int = field(init=False, repr=False, compare=False)
+    _rng: random.Random = field(init=False, repr=False, compare=False)
+    _net: np.ndarray = field(init=False, repr=False, compare=False)
+    _qty: np.ndarray = field(init=False, repr=False, compare=False)
+    _is_buy: np.ndarray = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         # Deterministic per-agent RNG (non-crypto)
-        seed = self.seed if self.seed is not None else (hash(self.agent_id) & 0xFFFF)
+        seed = self.seed if self.seed is not None else _stable_seed(self.agent_id)
+        self._seed = seed
         self._rng = random.Random(seed)  # noqa: S311
         steps = 24 * 60 // self.step_min
+        if self.load_kwh is None and self.pv_kwh is None:
+            # Common case: both profiles from the agent's own stream; shared across agents
+            # (and experiment cells) built with the same seed.
+            load, pv, rng_state = _default_profiles(seed, self.step_min)
+            self.load_kwh = list(load)
+            self.pv_kwh = list(pv)
+            self._rng.setstate(rng_state)
         if self.load_kwh is None:
             self.load_kwh = household_load_profile_kwh(step_min=self.step_min, rng=self._rng)
         if self.pv_kwh is None:
@@ -67,33 +144,38 @@ class Prosumer:
         if self.sell_discount_cents is None:
             self.sell_discount_cents = max(0.0, min(5.0, 0.5 + self._rng.gauss(0.0, 1.0)))
 
+        # Net position, quote quantity and side for the whole horizon (profiles are fixed).
+        # Neutral battery policy: no charge/discharge in Phase 2.
+        load_arr = np.asarray(self.load_kwh, dtype=np.float64)
+        pv_arr = np.asarray(self.pv_kwh, dtype=np.float64)
+        ev_arr = np.asarray(self.ev_kw, dtype=np.float64)
+        self._net = (load_arr + ev_arr * self.dt_h) - pv_arr
+        self._qty = np.abs(self._net)
+        self._is_buy = self._net > 0
+
     @property
     def dt_h(self) -> float:
         return self.step_min / 60.0
 
     def net_at(self, t: int) -> float:
-        assert self.load_kwh is not None and self.pv_kwh is not None and self.ev_kw is not None
-        ev_kwh = self.ev_kw[t] * self.dt_h
-        # Neutral battery policy: no charge/discharge in Phase 2
-        b_in_kwh = 0.0
-        b_out_kwh = 0.0
-        net = (self.load_kwh[t] + ev_kwh) - self.pv_kwh[t] - b_out_kwh + b_in_kwh
-        return net
+        return float(self._net[t])
+
+    def has_quote(self, t: int) -> bool:
+        """Cheap predicate: will make_quote(t) produce a quote? (No RNG draw.)"""
+        return bool(self._qty[t] >= QUOTE_EPS_KWH)
 
     def make_quote(self, t: int) -> tuple[float, float, Side] | None:
         """Produce a quote from net position: (price c/kWh, quantity kWh, side) or None.
 
         Simple heuristic pricing around retail defaults.
         """
-        net = self.net_at(t)
-        eps = 1e-6
-        if abs(net) < eps:
+        qty = float(self._qty[t])
+        if qty < QUOTE_EPS_KWH:
             return None
-        qty = abs(net)
-        # Price with heterogeneity and per-interval noise
+        # Price with heterogeneity and per-call noise (drawn fresh on every call)
         retail = self.price_anchor_cents
         noise = self._rng.gauss(0.0, self.quote_sigma_cents)
-        if net > 0:
+        if self._is_buy[t]:
             price = max(0.0, retail + float(self.buy_markup_cents or 0.5) + noise)
             side: Side = "buy"
         else:
@@ -101,7 +183,25 @@ class Prosumer:
             side = "sell"
         return price, qty, side
 
-    def decide(self, order_book_snapshot: dict, t: int) -> dict[str, Any]:
+    def _opposite_columns(self, snapshot: Any, side: str) -> OrderColumns:
+        """SoA arrays (prices, qtys, oids) of the book side a `side` quote would trade against.
+
+        Prefers the `bids_arr`/`asks_arr` columns the clearing step attaches to snapshots
+        (a `BookSnapshot` builds and keeps them on first access); otherwise extracts them
+        from the `bids`/`asks` lists or a `(bids, asks)` tuple. Nothing is written back into
+        a caller's plain dict, which may be edited and reused between decisions.
+        """
+        key = "asks" if side == "buy" else "bids"
+        if isinstance(snapshot, dict):
+            cols = snapshot.get(f"{key}_arr")
+            if cols is None:
+                cols = order_columns(snapshot.get(key, []))
+            return cast(OrderColumns, cols)
+        if isinstance(snapshot, tuple) and len(snapshot) == 2:
+            return order_columns(snapshot[1] if side == "buy" else snapshot[0])
+        return order_columns([])
+
+    def decide(self, order_book_snapshot: dict, t: int) -> Decision:
         """Decide on action based on a snapshot. Placeholder: always post."""
         _ = order_book_snapshot, t
-        return {"type": "post"}
+        return Decision("post")
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import random
-from typing import Any
 
-from .prosumer import Prosumer, Side
+from .prosumer import Decision, Prosumer, Side
 
 
 class ZIConstrained(Prosumer):
@@ -12,6 +11,10 @@ class ZIConstrained(Prosumer):
     Smoke-mode: generate random quotes within a plausible band, respecting a small qty.
     """
 
+    def has_quote(self, t: int) -> bool:
+        _ = t
+        return True
+
     def make_quote(self, t: int) -> tuple[float, float, Side] | None:
         _ = t
         price = random.uniform(10.0, 25.0)
@@ -20,6 +23,6 @@ class ZIConstrained(Prosumer):
         side: Side = random.choice(choices)
         return (round(price, 1), qty, side)
 
-    def decide(self, order_book_snapshot: dict, t: int) -> dict[str, Any]:
+    def decide(self, order_book_snapshot: dict, t: int) -> Decision:
         _ = order_book_snapshot, t
-        return {"type": "post"}
+        return Decision("post")
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class Battery:
@@ -81,6 +83,78 @@ class Battery:
         }
 
 
+def step_batch(
+    soc: np.ndarray,
+    capacity_kwh: np.ndarray,
+    power_kw: np.ndarray,
+    eta_chg: np.ndarray,
+    eta_dis: np.ndarray,
+    min_soc: np.ndarray,
+    charge_kw: np.ndarray,
+    discharge_kw: np.ndarray,
+    dt_h: float = 5.0 / 60.0,
+) -> dict[str, np.ndarray]:
+    """Vectorized `Battery.step` over a fleet (array arguments broadcast together).
+
+    Applies the same rules and float expressions as the scalar method, so each element
+    matches `Battery.step` exactly. Returns the same keys with array values; "soc" is the
+    updated state of charge (the inputs are not modified).
+    """
+    charge_kw = np.asarray(charge_kw, dtype=np.float64)
+    discharge_kw = np.asarray(discharge_kw, dtype=np.float64)
+    if np.any(charge_kw < 0) or np.any(discharge_kw < 0):
+        raise ValueError("charge_kw and discharge_kw must be non-negative")
+    soc = np.asarray(soc, dtype=np.float64)
+    capacity_kwh = np.asarray(capacity_kwh, dtype=np.float64)
+    eta_chg = np.asarray(eta_chg, dtype=np.float64)
+    eta_dis = np.asarray(eta_dis, dtype=np.float64)
+    min_soc = np.asarray(min_soc, dtype=np.float64)
+
+    # No simultaneous charge/discharge; prioritize larger request
+    both = (charge_kw > 0) & (discharge_kw > 0)
+    keep_charge = charge_kw >= discharge_kw
+    charge_kw = np.where(both & ~keep_charge, 0.0, charge_kw)
+    discharge_kw = np.where(both & keep_charge, 0.0, discharge_kw)
+
+    # Power caps
+    charge_kw = np.minimum(charge_kw, power_kw)
+    discharge_kw = np.minimum(discharge_kw, power_kw)
+
+    stored_kwh = soc * capacity_kwh
+    max_store_room = (1.0 - soc) * capacity_kwh
+    e_in_possible = np.minimum(charge_kw * dt_h * eta_chg, max_store_room)
+    in_scale = dt_h * eta_chg
+    charge_kw_actual = np.divide(
+        e_in_possible, in_scale, out=np.zeros_like(e_in_possible), where=in_scale > 0
+    )
+    loss_chg_kwh = charge_kw_actual * dt_h - e_in_possible
+    stored_kwh = stored_kwh + e_in_possible
+
+    max_energy_available = np.maximum(stored_kwh - min_soc * capacity_kwh, 0.0)
+    out_request = np.broadcast_to(discharge_kw * dt_h, max_energy_available.shape)
+    e_out_requested = np.divide(
+        out_request, eta_dis, out=np.zeros_like(max_energy_available), where=eta_dis > 0
+    )
+    e_out_stored_possible = np.minimum(e_out_requested, max_energy_available)
+    discharge_kw_actual = (
+        e_out_stored_possible * eta_dis / dt_h
+        if dt_h > 0
+        else np.zeros_like(e_out_stored_possible)
+    )
+    loss_dis_kwh = e_out_stored_possible - discharge_kw_actual * dt_h
+    stored_kwh = stored_kwh - e_out_stored_possible
+
+    new_soc = np.minimum(1.0, np.maximum(min_soc, stored_kwh / capacity_kwh))
+    return {
+        "charge_kw": charge_kw_actual,
+        "discharge_kw": discharge_kw_actual,
+        "e_in_stored_kwh": e_in_possible,
+        "e_out_stored_kwh": e_out_stored_possible,
+        "loss_kwh": loss_chg_kwh + loss_dis_kwh,
+        "soc": new_soc,
+    }
+
+
 def generate_ev_charging_profile_kw(
     *,
     minutes: int = 24 * 60,
@@ -97,12 +171,16 @@ def generate_ev_charging_profile_kw(
     """
     steps = minutes // step_min
     dt_h = step_min / 60.0
-    power = [0.0] * steps
+    power = np.zeros(steps)
     remaining = max(0.0, energy_kwh)
-    for i in range(arrival_slot, steps):
-        if remaining <= 0:
-            break
-        deliver = min(circuit_kw * dt_h, remaining)
-        power[i] = deliver / dt_h
-        remaining -= deliver
-    return power
+    step_kwh = circuit_kw * dt_h
+    if step_kwh <= 0 or arrival_slot >= steps:
+        return power.tolist()
+    # Full-power intervals from arrival, then one partial interval for the remainder
+    start = max(arrival_slot, 0)
+    n_full = min(int(remaining // step_kwh), steps - start)
+    power[start : start + n_full] = step_kwh / dt_h
+    tail_kwh = remaining - n_full * step_kwh
+    if tail_kwh > 0 and start + n_full < steps:
+        power[start + n_full] = tail_kwh / dt_h
+    return power.tolist()
@@ -1,18 +1,51 @@
 from __future__ import annotations
 
+import functools
 import math
 import random
 
+import numpy as np
 
-def diurnal_load_shape(steps: int, step_min: int) -> list[float]:
-    """Unitless diurnal shape with morning/evening peaks."""
-    shape = []
-    for i in range(steps):
-        t = i * step_min / 60.0
-        morning = math.exp(-((t - 8.0) ** 2) / 6.0)
-        evening = math.exp(-((t - 19.0) ** 2) / 6.0)
-        shape.append(0.3 + 0.5 * morning + 0.7 * evening)
-    return shape
+
+def _hours(steps: int, step_min: int) -> list[float]:
+    return (np.arange(steps) * step_min / 60.0).tolist()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_shape(steps: int, step_min: int) -> tuple[np.ndarray, float]:
+    """Read-only diurnal load shape and its sum; every household shares it.
+
+    Evaluated with math.exp (not np.exp, which differs in the last ulp) so cached
+    profiles match the original per-element loop exactly.
+    """
+    shape = np.array(
+        [
+            0.3 + 0.5 * math.exp(-((t - 8.0) ** 2) / 6.0) + 0.7 * math.exp(-((t - 19.0) ** 2) / 6.0)
+            for t in _hours(steps, step_min)
+        ]
+    )
+    shape.setflags(write=False)
+    return shape, sum(shape.tolist())
+
+
+@functools.lru_cache(maxsize=8)
+def _bell(steps: int, step_min: int) -> tuple[np.ndarray, float]:
+    """Read-only clear-sky bell and its sum (see `_load_shape`)."""
+    bell = np.array([math.exp(-((t - 12.0) ** 2) / 8.0) for t in _hours(steps, step_min)])
+    bell.setflags(write=False)
+    return bell, sum(bell.tolist())
+
+
+def _normal(rng: random.Random | np.random.Generator, mu: float, sigma: float) -> float:
+    if isinstance(rng, np.random.Generator):
+        return float(rng.normal(mu, sigma))
+    return rng.gauss(mu, sigma)
+
+
+@functools.lru_cache(maxsize=8)
+def diurnal_load_shape(steps: int, step_min: int) -> tuple[float, ...]:
+    """Unitless diurnal shape with morning/evening peaks (cached, immutable)."""
+    return tuple(_load_shape(steps, step_min)[0].tolist())
 
 
 def household_load_profile_kwh(
@@ -20,29 +53,26 @@ def household_load_profile_kwh(
     minutes: int = 24 * 60,
     step_min: int = 5,
     base_kwh_per_day: float = 30.0,
-    rng: random.Random | None = None,
+    rng: random.Random | np.random.Generator | None = None,
 ) -> list[float]:
     """Generate a household load profile summing to ~base_kwh_per_day with heterogeneity.
 
     Heterogeneity via log-normal scaler with sigma ~ 0.2 (moderate dispersion).
+    `rng` may be a `random.Random` (the agents' per-seed streams) or a NumPy Generator.
     """
     rng = rng or random.Random(0)  # noqa: S311
     steps = minutes // step_min
-    shape = diurnal_load_shape(steps, step_min)
-    s = sum(shape)
+    shape, s = _load_shape(steps, step_min)
     # Log-normal scaler
     sigma = 0.2
-    scale = math.exp(rng.gauss(0.0, sigma))
+    scale = math.exp(_normal(rng, 0.0, sigma))
     target = base_kwh_per_day * scale
-    return [v * (target / s) for v in shape]
+    return (shape * (target / s)).tolist()
 
 
-def clear_sky_bell(steps: int, step_min: int) -> list[float]:
-    out = []
-    for i in range(steps):
-        t = i * step_min / 60.0
-        out.append(max(0.0, math.exp(-((t - 12.0) ** 2) / 8.0)))
-    return out
+@functools.lru_cache(maxsize=8)
+def clear_sky_bell(steps: int, step_min: int) -> tuple[float, ...]:
+    return tuple(_bell(steps, step_min)[0].tolist())
 
 
 def lognormal_params_from_quantiles(median: float, p20: float, p80: float) -> tuple[float, float]:
@@ -59,11 +89,15 @@ def lognormal_params_from_quantiles(median: float, p20: float, p80: float) -> tu
 
 
 def sample_pv_nameplate_kw(
-    *, rng: random.Random, median: float = 7.4, p20: float = 5.0, p80: float = 11.0
+    *,
+    rng: random.Random | np.random.Generator,
+    median: float = 7.4,
+    p20: float = 5.0,
+    p80: float = 11.0,
 ) -> float:
     mu, sigma = lognormal_params_from_quantiles(median, p20, p80)
     # Draw from lognormal with these params
-    return math.exp(rng.gauss(mu, sigma))
+    return math.exp(_normal(rng, mu, sigma))
 
 
 def pv_profile_kwh(
@@ -73,27 +107,63 @@ def pv_profile_kwh(
     minutes: int = 24 * 60,
     step_min: int = 5,
     noise_std: float = 0.05,
-    rng: random.Random | None = None,
+    rng: random.Random | np.random.Generator | None = None,
 ) -> list[float]:
     """Generate a PV energy profile (kWh per interval).
 
     - Total daily energy ≈ nameplate_kw * 24h * capacity_factor.
     - Shape given by clear-sky bell; multiplicative noise; clipped at nameplate*dt.
+    - With a NumPy Generator as `rng` the noise is drawn in one batched call.
     """
     rng = rng or random.Random(0)  # noqa: S311
     steps = minutes // step_min
     dt_h = step_min / 60.0
-    bell = clear_sky_bell(steps, step_min)
-    s = sum(bell)
+    bell, s = _bell(steps, step_min)
     if s <= 0:
         return [0.0] * steps
     target_kwh = nameplate_kw * 24.0 * capacity_factor
-    base = [b * (target_kwh / s) for b in bell]
-    # Apply noise and clip at nameplate limit per interval
-    out = []
+    base = bell * (target_kwh / s)
+    # Apply noise and clip at nameplate limit per interval. A random.Random stream is drawn
+    # in interval order, so seeded agents keep their profiles.
+    if isinstance(rng, np.random.Generator):
+        eps = rng.normal(0.0, noise_std, steps)
+    else:
+        gauss = rng.gauss
+        eps = np.fromiter(
+            (gauss(0.0, noise_std) for _ in range(steps)), dtype=np.float64, count=steps
+        )
     max_kwh = nameplate_kw * dt_h
-    for v in base:
-        eps = rng.gauss(0.0, noise_std)
-        val = max(0.0, v * (1.0 + eps))
-        out.append(min(val, max_kwh))
-    return out
+    return np.minimum(np.maximum(0.0, base * (1.0 + eps)), max_kwh).tolist()
+
+
+def population_profiles_kwh(
+    n: int,
+    *,
+    rng: np.random.Generator,
+    minutes: int = 24 * 60,
+    step_min: int = 5,
+    base_kwh_per_day: float = 30.0,
+    capacity_factor: float = 0.16,
+    noise_std: float = 0.05,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load and PV profiles (kWh per interval, shape (n, steps)) and PV nameplates (kW) for
+    `n` households at once.
+
+    Same distributions as `household_load_profile_kwh`, `sample_pv_nameplate_kw` and
+    `pv_profile_kwh`, drawn from a NumPy Generator and computed as whole (n, steps)
+    arrays. Not stream-compatible with the per-agent `random.Random` generators, so
+    seeded agents keep using those.
+    """
+    steps = minutes // step_min
+    dt_h = step_min / 60.0
+    shape, s_load = _load_shape(steps, step_min)
+    targets = base_kwh_per_day * np.exp(rng.normal(0.0, 0.2, n))
+    load = shape[None, :] * (targets / s_load)[:, None]
+
+    mu, sigma = lognormal_params_from_quantiles(7.4, 5.0, 11.0)
+    nameplate = np.exp(rng.normal(mu, sigma, n))
+    bell, s_bell = _bell(steps, step_min)
+    base = bell[None, :] * (nameplate * 24.0 * capacity_factor / s_bell)[:, None]
+    eps = rng.normal(0.0, noise_std, (n, steps))
+    pv = np.minimum(np.maximum(0.0, base * (1.0 + eps)), (nameplate * dt_h)[:, None])
+    return load, pv, nameplate
@@ -0,0 +1,71 @@
+"""Numeric kernels for the batch (call auction) match over SoA order columns.
+
+Compiled with Numba when the optional `opt` extra is installed; otherwise the same code runs
+as plain Python (no fastmath, so both paths produce identical floats).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    HAVE_NUMBA = False
+
+
+def _batch_match_pairs(
+    bid_prices: np.ndarray,
+    bid_qtys: np.ndarray,
+    ask_prices: np.ndarray,
+    ask_qtys: np.ndarray,
+    cap_kwh: float,
+    has_cap: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int, int, float]:
+    """Greedy two-pointer match of best-first bids against best-first asks.
+
+    Decrements `bid_qtys`/`ask_qtys` in place and returns the matched (bid index, ask index,
+    qty) triples in fill order, the final bid/ask pointers (orders before them are fully
+    filled) and the total traded; `cap_kwh` bounds that total when `has_cap`.
+    """
+    size = bid_prices.size + ask_prices.size + 1
+    out_i = np.empty(size, dtype=np.int64)
+    out_j = np.empty(size, dtype=np.int64)
+    out_q = np.empty(size, dtype=np.float64)
+    k = 0
+    i = 0
+    j = 0
+    traded = 0.0
+    while i < bid_prices.size and j < ask_prices.size:
+        if bid_prices[i] < ask_prices[j]:
+            break
+        qty = min(bid_qtys[i], ask_qtys[j])
+        if has_cap:
+            remaining = max(0.0, cap_kwh - traded)
+            if remaining <= 0:
+                break
+            qty = min(qty, remaining)
+        if qty <= 0:
+            break
+        if k == out_q.size:
+            # Cap-limited fills need not advance either pointer; grow the output
+            out_i = np.concatenate((out_i, np.empty(size, dtype=np.int64)))
+            out_j = np.concatenate((out_j, np.empty(size, dtype=np.int64)))
+            out_q = np.concatenate((out_q, np.empty(size, dtype=np.float64)))
+        out_i[k] = i
+        out_j[k] = j
+        out_q[k] = qty
+        k += 1
+        traded += qty
+        bid_qtys[i] -= qty
+        ask_qtys[j] -= qty
+        if bid_qtys[i] <= 0:
+            i += 1
+        if ask_qtys[j] <= 0:
+            j += 1
+    return out_i[:k], out_j[:k], out_q[:k], i, j, traded
+
+
+batch_match_pairs = njit(cache=True)(_batch_match_pairs) if HAVE_NUMBA else _batch_match_pairs
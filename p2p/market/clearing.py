@@ -2,13 +2,20 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any, cast
+from operator import attrgetter
+from time import perf_counter
+from typing import Any
 
-from ..agents.prosumer import Prosumer, Side
-from .order_book import Order, OrderBook, Trade
+import numpy as np
 
+from ..agents.prosumer import Decision, Prosumer, Side
+from ._fastpath import batch_match_pairs
+from .order_book import BookSnapshot, Order, OrderBook, OrderColumns, Trade, order_columns
 
-@dataclass
+_NO_COLUMNS = order_columns([])
+
+
+@dataclass(slots=True)
 class ClearingResult:
     trades: int
     traded_kwh: float
@@ -20,6 +27,29 @@ class ClearingResult:
     posted_asks: list[Order]
     book_bids_start: list[Order]
     book_asks_start: list[Order]
+    # SoA (price, qty, order_id) of book_*_start + posted_*, in that order, for the
+    # planner bound; empty when history is not recorded
+    bid_columns: OrderColumns = _NO_COLUMNS
+    ask_columns: OrderColumns = _NO_COLUMNS
+
+
+def _union_columns(start: OrderColumns, posted: list[Order]) -> OrderColumns:
+    """Columns of the resting orders behind `start` followed by those of `posted`."""
+    if not posted:
+        return start
+    extra = order_columns(posted)
+    return OrderColumns(*(np.concatenate(pair) for pair in zip(start, extra, strict=True)))
+
+
+def _agent_snapshot(ob: OrderBook, info_set: str) -> BookSnapshot:
+    """Snapshot handed to agents; SoA columns come from the book's per-side cache.
+
+    The full-book variant hands out the book's read-only `bids`/`asks` views rather than
+    copying them: the book only changes after decide() returns.
+    """
+    if info_set == "ticker":
+        return BookSnapshot(ob.bids[:1], ob.asks[:1])
+    return BookSnapshot(ob.bids, ob.asks, ob.columns)
 
 
 def step_interval(
@@ -29,130 +59,69 @@ def step_interval(
     *,
     info_set: str = "book",
     decision_logger: Callable[[Prosumer, dict[str, Any] | Any, float], None] | None = None,
+    record_history: bool = True,
 ) -> ClearingResult:
     """One interval: agents inspect book and either accept or post; CDA matches (maker-price).
 
     - If `decision_logger` is provided, this function will time and log each agent's
       decide() call via the callback and reuse that action (no second decide()).
     - `info_set`: 'book' for full book snapshots or 'ticker' for top-of-book only.
+    - `record_history=False` leaves the result's posted_*/book_*_start lists empty and
+      skips copying the starting book (for runs that do not compute per-interval metrics).
     """
     posted = 0.0
     posted_buy = 0.0
     posted_sell = 0.0
     posted_bids: list[Order] = []
     posted_asks: list[Order] = []
-    # Snapshot resting book at start of interval (before submissions) and deep-copy orders
-    _bids0, _asks0 = ob.snapshot()
-    book_bids_start = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in _bids0
-    ]
-    book_asks_start = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in _asks0
-    ]
+    posted_by_side = {"buy": posted_bids, "sell": posted_asks}
+    # Resting book at start of interval (before submissions). The book replaces rather than
+    # mutates orders it partially fills, so its shallow per-version snapshot is enough.
+    book_bids_start, book_asks_start = ob.snapshot() if record_history else ([], [])
+    # The book's cached columns are replaced, never mutated, as it changes
+    bid_cols_start = ob.columns("bids") if record_history else _NO_COLUMNS
+    ask_cols_start = ob.columns("asks") if record_history else _NO_COLUMNS
+    # Snapshot per info set, rebuilt only when the book version has moved (agents that
+    # stay quiet leave it as is)
+    snapshot: BookSnapshot | None = None
+    snapshot_version = -1
     for a in agents:
-        # Build snapshot per info set
-        bids0, asks0 = ob.snapshot()
-        snapshot = (
-            {"bids": bids0[:1], "asks": asks0[:1]}
-            if info_set == "ticker"
-            else {"bids": bids0, "asks": asks0}
-        )
+        if snapshot is None or snapshot_version != ob.version:
+            snapshot = _agent_snapshot(ob, info_set)
+            snapshot_version = ob.version
         # Decide once; optionally time and log via callback
         if decision_logger is not None:
-            from ..sim.profiling import time_call
-
-            act, wall_ms = time_call(a.decide, snapshot, t)
+            # Timed inline (no wrapper frame) so wall_ms is the decide() call itself
+            start = perf_counter()
+            act = a.decide(snapshot, t)
+            wall_ms = (perf_counter() - start) * 1000.0
             decision_logger(a, act, wall_ms)
         else:
             act = a.decide(snapshot, t)
-        # Allow accept if agent chooses
-        if isinstance(act, dict) and act.get("type") == "accept":
-            side = cast(Side, act.get("side", "buy"))
-            price = float(act.get("price", 0.0))
-            qty = float(act.get("qty_kwh", 0.0))
-            if qty > 0:
-                _order_id, _ = ob.submit(
-                    agent_id=a.agent_id, side=side, price_cperkwh=price, qty_kwh=qty
-                )
-                posted += qty
-                if side == "buy":
-                    posted_buy += qty
-                    posted_bids.append(
-                        Order(
-                            order_id=0,
-                            price_cperkwh=price,
-                            qty_kwh=qty,
-                            side=side,
-                            agent_id=a.agent_id,
-                            arrival_seq=0,
-                        )
-                    )
-                else:
-                    posted_sell += qty
-                    posted_asks.append(
-                        Order(
-                            order_id=0,
-                            price_cperkwh=price,
-                            qty_kwh=qty,
-                            side=side,
-                            agent_id=a.agent_id,
-                            arrival_seq=0,
-                        )
-                    )
+        # Take the agent's accept if it names a quantity; otherwise post a fresh quote
+        d = Decision.of(act)
+        if d is not None and d.type == "accept" and (d.qty_kwh or 0.0) > 0:
+            side: Side = d.side or "buy"
+            price = float(d.price or 0.0)
+            qty = float(d.qty_kwh or 0.0)
+        else:
+            q = a.make_quote(t)
+            if q is None:
                 continue
-
-        # Otherwise, post a fresh quote
-        q = a.make_quote(t)
-        if q is None:
-            continue
-        price, qty, side = q
+            price, qty, side = q
         posted += qty
         if side == "buy":
             posted_buy += qty
-            posted_bids.append(
-                Order(
-                    order_id=0,
-                    price_cperkwh=price,
-                    qty_kwh=qty,
-                    side=side,
-                    agent_id=a.agent_id,
-                    arrival_seq=0,
-                )
-            )
         else:
             posted_sell += qty
-            posted_asks.append(
-                Order(
-                    order_id=0,
-                    price_cperkwh=price,
-                    qty_kwh=qty,
-                    side=side,
-                    agent_id=a.agent_id,
-                    arrival_seq=0,
-                )
-            )
+        if record_history:
+            posted_by_side[side].append(Order(0, price, qty, side, a.agent_id, 0))
         _order_id, _ = ob.submit(
             agent_id=a.agent_id, side=side, price_cperkwh=price, qty_kwh=qty
         )
 
+    traded = ob.traded_kwh
     interval_trades = ob.clear_trades()
-    traded = sum(tr.qty_kwh for tr in interval_trades)
     return ClearingResult(
         trades=len(interval_trades),
         traded_kwh=traded,
@@ -164,17 +133,36 @@ def step_interval(
         posted_asks=posted_asks,
         book_bids_start=book_bids_start,
         book_asks_start=book_asks_start,
+        bid_columns=_union_columns(bid_cols_start, posted_bids) if record_history else _NO_COLUMNS,
+        ask_columns=_union_columns(ask_cols_start, posted_asks) if record_history else _NO_COLUMNS,
     )
 
 
-def _sort_bids(b: list[Order]) -> list[Order]:
-    # price desc, FIFO within price by arrival_seq
-    return sorted(b, key=lambda o: (-o.price_cperkwh, o.arrival_seq))
+def _priority_sorted(orders: list[Order], *, bids: bool) -> tuple[list[Order], OrderColumns]:
+    """Orders in price-time priority with their SoA columns, ordered by one np.lexsort.
 
+    Bids by price desc, asks by price asc; FIFO within price by arrival_seq. lexsort is
+    stable, so full ties keep their input order as the previous keyed sort did.
+    """
+    cols = order_columns(orders)
+    seq = np.fromiter(map(attrgetter("arrival_seq"), orders), dtype=np.int64, count=len(orders))
+    perm = np.lexsort((seq, -cols.prices if bids else cols.prices))
+    return [orders[k] for k in perm.tolist()], OrderColumns(*(c[perm] for c in cols))
 
-def _sort_asks(a: list[Order]) -> list[Order]:
-    # price asc, FIFO within price
-    return sorted(a, key=lambda o: (o.price_cperkwh, o.arrival_seq))
+
+def _unfilled(orders: list[Order], qtys: np.ndarray, start: int) -> list[Order]:
+    """Residual side after the match pointer stopped at `start` (earlier orders are filled).
+
+    Only the order at `start` can be partially filled; it is re-created with its
+    remaining quantity. Residuals stay in priority order.
+    """
+    out = orders[start:]
+    if out and qtys[start] != out[0].qty_kwh:
+        o = out[0]
+        out[0] = Order(
+            o.order_id, o.price_cperkwh, float(qtys[start]), o.side, o.agent_id, o.arrival_seq
+        )
+    return [o for o in out if o.qty_kwh > 0]
 
 
 def _batch_match(
@@ -183,38 +171,35 @@ def _batch_match(
     *,
     feeder_limit_kw: float | None = None,
     step_min: int = 5,
-) -> tuple[list[Trade], list[Order], list[Order]]:
+) -> tuple[list[Trade], list[Order], list[Order], float]:
     """Greedy batch match by price-time priority; maker-price rule.
 
-    Returns (trades, residual_bids, residual_asks).
+    Returns (trades, residual_bids, residual_asks, traded_kwh). The input orders are not mutated:
+    untouched orders are passed through to the residuals and a partially filled one is
+    replaced by a copy carrying its remaining quantity.
     """
-    b = _sort_bids(list(bids))
-    a = _sort_asks(list(asks))
-    trades: list[Trade] = []
-    i = 0
-    j = 0
-    traded_kwh = 0.0
+    b, bid_cols = _priority_sorted(list(bids), bids=True)
+    a, ask_cols = _priority_sorted(list(asks), bids=False)
     cap_kwh = None
     if feeder_limit_kw is not None:
         cap_kwh = feeder_limit_kw * (step_min / 60.0)
-    while i < len(b) and j < len(a):
-        bb = b[i]
-        aa = a[j]
-        if bb.price_cperkwh < aa.price_cperkwh:
-            break
-        qty = min(bb.qty_kwh, aa.qty_kwh)
-        if cap_kwh is not None:
-            remaining = max(0.0, cap_kwh - traded_kwh)
-            if remaining <= 0:
-                break
-            qty = min(qty, remaining)
-        if qty <= 0:
-            break
+    bid_qtys, ask_qtys = bid_cols.qtys, ask_cols.qtys
+    fill_i, fill_j, fill_q, i, j, traded_kwh = batch_match_pairs(
+        bid_cols.prices,
+        bid_qtys,
+        ask_cols.prices,
+        ask_qtys,
+        0.0 if cap_kwh is None else cap_kwh,
+        cap_kwh is not None,
+    )
+    trades: list[Trade] = []
+    for bi, aj, qty in zip(fill_i.tolist(), fill_j.tolist(), fill_q.tolist(), strict=True):
+        bb = b[bi]
+        aa = a[aj]
         # Trade at maker (resting) price: we take the ask's price if pairing buyer to seller
-        price = aa.price_cperkwh
         trades.append(
             Trade(
-                price_cperkwh=price,
+                price_cperkwh=aa.price_cperkwh,
                 qty_kwh=qty,
                 buy_agent=bb.agent_id,
                 sell_agent=aa.agent_id,
@@ -224,20 +209,9 @@ def _batch_match(
                 ask_price_cperkwh=aa.price_cperkwh,
             )
         )
-        traded_kwh += qty
-        bb.qty_kwh -= qty
-        aa.qty_kwh -= qty
-        if bb.qty_kwh <= 0:
-            i += 1
-        if aa.qty_kwh <= 0:
-            j += 1
-    # Residuals: keep positive-qty orders
-    residual_b = [o for o in b[i:] if o.qty_kwh > 0] + [o for o in b[:i] if o.qty_kwh > 0]
-    residual_a = [o for o in a[j:] if o.qty_kwh > 0] + [o for o in a[:j] if o.qty_kwh > 0]
-    # Ensure sorted
-    residual_b = _sort_bids(residual_b)
-    residual_a = _sort_asks(residual_a)
-    return trades, residual_b, residual_a
+    residual_b = _unfilled(b, bid_qtys, i)
+    residual_a = _unfilled(a, ask_qtys, j)
+    return trades, residual_b, residual_a, traded_kwh
 
 
 def step_interval_call(
@@ -248,12 +222,14 @@ def step_interval_call(
     info_set: str = "book",
     decision_logger: Callable[[Prosumer, dict[str, Any] | Any, float], None] | None = None,
     feeder_limit_kw: float | None = None,
+    record_history: bool = True,
 ) -> ClearingResult:
     """Periodic call auction variant: collect actions, then batch match once per interval.
 
     - Uses price-time priority within the batch; maker-price rule.
     - Optionally enforces a feeder capacity cap (kW) converted to kWh for the interval.
     - `info_set`: 'book' (full book) or 'ticker' (top-of-book only).
+    - `record_history=False` reports empty posted_*/book_*_start lists.
     """
     posted = 0.0
     posted_buy = 0.0
@@ -261,51 +237,29 @@ def step_interval_call(
     posted_bids: list[Order] = []
     posted_asks: list[Order] = []
 
-    # Snapshot starting resting book
-    bids0, asks0 = ob.snapshot()
-    book_bids_start = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in bids0
-    ]
-    book_asks_start = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in asks0
-    ]
-
-    # Assign arrival_seq to new posts after existing max
-    next_seq = max([o.arrival_seq for o in bids0 + asks0] + [0]) + 1
+    # Starting resting book. The batch match below does not mutate orders and the book is
+    # then replaced by the residuals, so these need no deep copy.
+    book_bids_start, book_asks_start = ob.snapshot()
+    bid_cols_start = ob.columns("bids") if record_history else _NO_COLUMNS
+    ask_cols_start = ob.columns("asks") if record_history else _NO_COLUMNS
 
+    # The resting book does not change until the batch match, so one snapshot serves everyone
+    snap = _agent_snapshot(ob, info_set)
     for a in agents:
-        # information set
-        b, k = ob.snapshot()
-        snap = {"bids": b[:1], "asks": k[:1]} if info_set == "ticker" else {"bids": b, "asks": k}
         # Decide once; optionally time/log and reuse action
         if decision_logger is not None:
-            from ..sim.profiling import time_call
-
-            act, wall_ms = time_call(a.decide, snap, t)
+            start = perf_counter()
+            act = a.decide(snap, t)
+            wall_ms = (perf_counter() - start) * 1000.0
             decision_logger(a, act, wall_ms)
         else:
             act = a.decide(snap, t)
         # In a call auction, treat accept as a post (marketable limit) to be cleared in batch.
-        if isinstance(act, dict) and act.get("type") in {"accept", "post"}:
-            price = float(act.get("price") or 0.0)
-            qty = float(act.get("qty_kwh") or 0.0)
-            side = str(act.get("side") or (a.make_quote(t) or (0.0, 0.0, "buy"))[2])
+        d = Decision.of(act)
+        if d is not None and d.type in {"accept", "post"}:
+            price = float(d.price or 0.0)
+            qty = float(d.qty_kwh or 0.0)
+            side = str(d.side or (a.make_quote(t) or (0.0, 0.0, "buy"))[2])
             # If no qty in accept/post, fall back to quote
             if qty <= 0:
                 q = a.make_quote(t)
@@ -318,9 +272,9 @@ def step_interval_call(
                 qty_kwh=qty,
                 side=side,  # type: ignore[arg-type]
                 agent_id=a.agent_id,
-                arrival_seq=next_seq,
+                # New posts queue behind every resting order at the same price
+                arrival_seq=ob.next_arrival_seq(),
             )
-            next_seq += 1
             posted += qty
             if side == "buy":
                 posted_buy += qty
@@ -329,41 +283,17 @@ def step_interval_call(
                 posted_sell += qty
                 posted_asks.append(order)
 
-    # Union and batch match once
-    union_bids = book_bids_start + posted_bids
-    union_asks = book_asks_start + posted_asks
-    # Important: match on copies so book_bids_start/posted_* remain immutable for metrics.
-    union_bids_copy = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in union_bids
-    ]
-    union_asks_copy = [
-        Order(
-            order_id=o.order_id,
-            price_cperkwh=o.price_cperkwh,
-            qty_kwh=o.qty_kwh,
-            side=o.side,
-            agent_id=o.agent_id,
-            arrival_seq=o.arrival_seq,
-        )
-        for o in union_asks
-    ]
-    trades, residual_bids, residual_asks = _batch_match(
-        union_bids_copy, union_asks_copy, feeder_limit_kw=feeder_limit_kw
+    # Union and batch match once. _batch_match leaves its inputs untouched, so
+    # book_bids_start/posted_* stay as posted for metrics without copying them.
+    trades, residual_bids, residual_asks, traded = _batch_match(
+        book_bids_start + posted_bids,
+        book_asks_start + posted_asks,
+        feeder_limit_kw=feeder_limit_kw,
     )
 
     # Update OB state for next interval
-    ob.bids = residual_bids
-    ob.asks = residual_asks
+    ob.set_resting(residual_bids, residual_asks)
     # Report
-    traded = sum(tr.qty_kwh for tr in trades)
     return ClearingResult(
         trades=len(trades),
         traded_kwh=traded,
@@ -371,8 +301,10 @@ def step_interval_call(
         posted_buy_kwh=posted_buy,
         posted_sell_kwh=posted_sell,
         trades_detail=trades,
-        posted_bids=posted_bids,
-        posted_asks=posted_asks,
-        book_bids_start=book_bids_start,
-        book_asks_start=book_asks_start,
+        posted_bids=posted_bids if record_history else [],
+        posted_asks=posted_asks if record_history else [],
+        book_bids_start=book_bids_start if record_history else [],
+        book_asks_start=book_asks_start if record_history else [],
+        bid_columns=_union_columns(bid_cols_start, posted_bids) if record_history else _NO_COLUMNS,
+        ask_columns=_union_columns(ask_cols_start, posted_asks) if record_history else _NO_COLUMNS,
     )
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import itertools
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass, field
-from typing import Literal
+from operator import attrgetter, itemgetter
+from typing import Any, Literal, NamedTuple, overload
+
+import numpy as np
 
 Side = Literal["buy", "sell"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     order_id: int
     price_cperkwh: float
@@ -16,7 +22,7 @@ class Order:
     arrival_seq: int  # FIFO within price
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     price_cperkwh: float
     qty_kwh: float
@@ -28,6 +34,123 @@ class Trade:
     ask_price_cperkwh: float
 
 
+def _with_qty(o: Order, qty_kwh: float) -> Order:
+    """Copy of resting order `o` with a new quantity.
+
+    The book never mutates an order once it rests, so snapshots and per-interval reports
+    can share the order objects instead of deep-copying them.
+    """
+    return Order(o.order_id, o.price_cperkwh, qty_kwh, o.side, o.agent_id, o.arrival_seq)
+
+
+def _inserted(arr: np.ndarray, pos: int, value: float) -> np.ndarray:
+    """New 1-D array with `value` inserted before index `pos` (np.insert without its
+    generic axis/index handling, which dominates the cost for a single scalar)."""
+    out = np.empty(arr.size + 1, dtype=arr.dtype)
+    out[:pos] = arr[:pos]
+    out[pos] = value
+    out[pos + 1 :] = arr[pos:]
+    return out
+
+
+class OrderColumns(NamedTuple):
+    """Struct-of-arrays view of one book side, in that side's price-time priority."""
+
+    prices: np.ndarray  # float64, cents/kWh
+    qtys: np.ndarray  # float64, kWh
+    oids: np.ndarray  # int64
+
+
+def order_columns(orders: Sequence[Any]) -> OrderColumns:
+    """Extract parallel price/qty/order_id arrays from a sequence of orders.
+
+    Accepts `Order` objects or legacy `(price, qty, side, order_id)` tuples. The element type
+    is detected once from the first entry (sequences are homogeneous) and every field is read
+    with a single attrgetter/itemgetter; values are taken as-is, so a 0.0 price is a price,
+    never a "missing" marker.
+    """
+    n = len(orders)
+    get_price: Callable[[Any], Any]
+    get_qty: Callable[[Any], Any]
+    get_oid: Callable[[Any], Any]
+    if n and not hasattr(orders[0], "price_cperkwh"):
+        get_price, get_qty, get_oid = itemgetter(0), itemgetter(1), itemgetter(3)
+    else:
+        get_price = attrgetter("price_cperkwh")
+        get_qty = attrgetter("qty_kwh")
+        get_oid = attrgetter("order_id")
+    return OrderColumns(
+        np.fromiter(map(get_price, orders), dtype=np.float64, count=n),
+        np.fromiter(map(get_qty, orders), dtype=np.float64, count=n),
+        np.fromiter(map(get_oid, orders), dtype=np.int64, count=n),
+    )
+
+
+class BookSnapshot(dict[str, Any]):
+    """Agent-facing book snapshot: `bids`/`asks` order sequences, best price first.
+
+    The SoA columns `bids_arr`/`asks_arr` are materialized on first access, through
+    `columns` when given (e.g. `OrderBook.columns`, which caches them until that side of
+    the book changes), so an agent only pays for the side it actually reads.
+    """
+
+    def __init__(
+        self,
+        bids: Sequence[Order],
+        asks: Sequence[Order],
+        columns: Callable[[str], OrderColumns] | None = None,
+    ) -> None:
+        super().__init__(bids=bids, asks=asks)
+        self._columns = columns
+
+    def __missing__(self, key: str) -> OrderColumns:
+        if key not in ("bids_arr", "asks_arr"):
+            raise KeyError(key)
+        side = key[:-4]
+        cols = self._columns(side) if self._columns is not None else order_columns(self[side])
+        self[key] = cols
+        return cols
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self or key in ("bids_arr", "asks_arr"):
+            return self[key]
+        return default
+
+
+class RestingOrders(Sequence[Order]):
+    """Read-only view of one side of an `OrderBook`, best price first.
+
+    Wraps the book's list without copying it, so it follows the book's updates (until
+    `set_resting` swaps the list out); take `list(view)` to keep the orders as they are
+    now. Slices are tuples.
+    """
+
+    __slots__ = ("_orders",)
+
+    def __init__(self, orders: list[Order]) -> None:
+        self._orders = orders
+
+    @overload
+    def __getitem__(self, i: int) -> Order: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> tuple[Order, ...]: ...
+
+    def __getitem__(self, i: int | slice) -> Order | tuple[Order, ...]:
+        if isinstance(i, slice):
+            return tuple(self._orders[i])
+        return self._orders[i]
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(self._orders)
+
+    def __repr__(self) -> str:
+        return f"RestingOrders({self._orders!r})"
+
+
 @dataclass
 class OrderBook:
     """Price-time priority order book with maker-price matching.
@@ -39,11 +162,25 @@ class OrderBook:
     """
 
     tick_cents: float = 0.1
-    bids: list[Order] = field(default_factory=list)
-    asks: list[Order] = field(default_factory=list)
-    _id_counter: int = 0
-    _arrival_counter: int = 0
+    # Resting orders, best first; read through `bids`/`asks` and replaced via set_resting()
+    _bids: list[Order] = field(init=False, default_factory=list)
+    _asks: list[Order] = field(init=False, default_factory=list)
+    # Order ids and arrival sequence numbers, both from 1 (arrivals continue after any orders
+    # set_resting() is given). Kept apart: the call auction stamps arrivals on orders that
+    # never get a book-assigned id.
+    _ids: Iterator[int] = field(default_factory=lambda: itertools.count(1), repr=False)
+    _arrivals: Iterator[int] = field(default_factory=lambda: itertools.count(1), repr=False)
     _trades: list[Trade] = field(default_factory=list)
+    # Sum of _trades' quantities, accumulated in fill order
+    _traded_kwh: float = 0.0
+    # SoA columns per side ("bids"/"asks"), dropped whenever that side changes
+    _columns: dict[str, OrderColumns] = field(default_factory=dict, repr=False)
+    # Bumped by every change to the resting book; keys the memoized snapshot()
+    _version: int = 0
+    _snapshot: tuple[int, list[Order], list[Order]] | None = field(default=None, repr=False)
+    # Normalized price per tick count, valid for tick size `_tick_prices_for`
+    _tick_prices: dict[int, float] = field(default_factory=dict, repr=False)
+    _tick_prices_for: float = field(default=0.0, repr=False)
 
     # ---------- Public API ----------
     def submit(
@@ -56,16 +193,15 @@ class OrderBook:
         if qty_kwh <= 0:
             raise ValueError("qty_kwh must be positive")
         price = self._normalize_price(price_cperkwh)
-        self._id_counter += 1
-        self._arrival_counter += 1
         incoming = Order(
-            order_id=self._id_counter,
+            order_id=next(self._ids),
             price_cperkwh=price,
             qty_kwh=qty_kwh,
             side=side,
             agent_id=agent_id,
-            arrival_seq=self._arrival_counter,
+            arrival_seq=next(self._arrivals),
         )
+        self._version += 1
         trades = self._match(incoming)
         # If residual remains, add to resting book
         if incoming.qty_kwh > 0:
@@ -74,10 +210,12 @@ class OrderBook:
 
     def cancel(self, order_id: int) -> bool:
         """Cancel a resting order by id."""
-        for book in (self.bids, self.asks):
+        for name, book in (("bids", self._bids), ("asks", self._asks)):
             for i, o in enumerate(book):
                 if o.order_id == order_id:
                     del book[i]
+                    self._columns.pop(name, None)
+                    self._version += 1
                     return True
         return False
 
@@ -97,18 +235,20 @@ class OrderBook:
         order: Order | None = None
         idx: int | None = None
         book: list[Order] | None = None
-        for _bname, b in (("bids", self.bids), ("asks", self.asks)):
+        for bname, b in (("bids", self._bids), ("asks", self._asks)):
             for i, o in enumerate(b):
                 if o.order_id == order_id:
                     side = o.side
                     order = o
                     idx = i
                     book = b
+                    self._columns.pop(bname, None)
                     break
             if order is not None:
                 break
         if order is None or idx is None or book is None or side is None:
             return False
+        self._version += 1
 
         # Quantity-only change
         if new_price_cperkwh is None:
@@ -117,7 +257,7 @@ class OrderBook:
             if new_qty_kwh <= 0:
                 del book[idx]
                 return True
-            order.qty_kwh = new_qty_kwh
+            book[idx] = _with_qty(order, new_qty_kwh)
             return True
 
         # Price change: cancel and resubmit at new price
@@ -131,80 +271,164 @@ class OrderBook:
         return True
 
     def best_bid(self) -> float | None:
-        return self.bids[0].price_cperkwh if self.bids else None
+        return self._bids[0].price_cperkwh if self._bids else None
 
     def best_ask(self) -> float | None:
-        return self.asks[0].price_cperkwh if self.asks else None
+        return self._asks[0].price_cperkwh if self._asks else None
+
+    @property
+    def bids(self) -> RestingOrders:
+        """Resting bids, best price first (read-only; replace them with `set_resting`)."""
+        return RestingOrders(self._bids)
+
+    @property
+    def asks(self) -> RestingOrders:
+        """Resting asks, best price first (read-only; replace them with `set_resting`)."""
+        return RestingOrders(self._asks)
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the resting book does (submit, cancel, modify or
+        set_resting)."""
+        return self._version
 
     def snapshot(self) -> tuple[list[Order], list[Order]]:
-        return list(self.bids), list(self.asks)
+        """Copies of the resting bids and asks, memoized until the book next changes.
+
+        Repeated calls between mutations return the same lists; treat them as read-only.
+        """
+        snap = self._snapshot
+        if snap is None or snap[0] != self._version:
+            snap = (self._version, list(self._bids), list(self._asks))
+            self._snapshot = snap
+        return snap[1], snap[2]
+
+    def columns(self, side: str) -> OrderColumns:
+        """SoA (prices, qtys, oids) of the resting `"bids"` or `"asks"`, in priority order.
+
+        Cached until that side of the book changes; treat the arrays as read-only.
+        """
+        cols = self._columns.get(side)
+        if cols is None:
+            cols = order_columns(self._bids if side == "bids" else self._asks)
+            self._columns[side] = cols
+        return cols
+
+    def next_arrival_seq(self) -> int:
+        """Reserve the next arrival sequence number; later than every order in the book."""
+        return next(self._arrivals)
+
+    def set_resting(self, bids: list[Order], asks: list[Order]) -> None:
+        """Replace the resting book (e.g. with a call auction's residuals).
+
+        Later arrivals are stamped after every order in `bids` and `asks`, whatever their
+        arrival_seq values came from. The book takes ownership of both lists.
+        """
+        self._bids = bids
+        self._asks = asks
+        self._columns.clear()
+        self._version += 1
+        self._continue_arrivals(bids)
+        self._continue_arrivals(asks)
+
+    @property
+    def traded_kwh(self) -> float:
+        """Total quantity of the trades recorded since the last `clear_trades()`."""
+        return self._traded_kwh
 
     def clear_trades(self) -> list[Trade]:
         out = self._trades
         self._trades = []
+        self._traded_kwh = 0.0
         return out
 
     # ---------- Internal helpers ----------
+    def _continue_arrivals(self, orders: list[Order]) -> None:
+        """Move the arrival counter past the latest arrival_seq in `orders` (never back)."""
+        if not orders:
+            return
+        latest = max(o.arrival_seq for o in orders)
+        nxt = next(self._arrivals)
+        self._arrivals = itertools.count(max(nxt, latest + 1))
+
     def _normalize_price(self, p: float) -> float:
         if p < 0:
             raise ValueError("price must be non-negative")
-        # Round to nearest tick
+        # Round to nearest tick. Quotes carry noise but land on few ticks, so the 3-decimal
+        # rounding of each tick's price (the costly part) is memoized per tick count.
         tick = self.tick_cents
-        return round(round(p / tick) * tick, 3)
+        if tick != self._tick_prices_for:
+            self._tick_prices.clear()
+            self._tick_prices_for = tick
+        k = round(p / tick)
+        price = self._tick_prices.get(k)
+        if price is None:
+            price = self._tick_prices[k] = round(k * tick, 3)
+        return price
 
     def _rest(self, order: Order) -> None:
         if order.side == "buy":
-            self._insert_sorted(self.bids, order, reverse=True)
+            name = "bids"
+            pos = self._insert_sorted(self._bids, order, reverse=True)
         else:
-            self._insert_sorted(self.asks, order, reverse=False)
+            name = "asks"
+            pos = self._insert_sorted(self._asks, order, reverse=False)
+        # Keep cached columns in step (fresh arrays, so earlier snapshots stay valid)
+        cols = self._columns.get(name)
+        if cols is not None:
+            self._columns[name] = OrderColumns(
+                _inserted(cols.prices, pos, order.price_cperkwh),
+                _inserted(cols.qtys, pos, order.qty_kwh),
+                _inserted(cols.oids, pos, order.order_id),
+            )
 
     @staticmethod
-    def _insert_sorted(book: list[Order], order: Order, *, reverse: bool) -> None:
+    def _insert_sorted(book: list[Order], order: Order, *, reverse: bool) -> int:
         # Insert maintaining price order.
         # For bids: descending price (reverse=True). For asks: ascending price.
-        # FIFO is preserved within a price level.
-        key_price = order.price_cperkwh
-        pos = 0
+        # FIFO is preserved within a price level. The book is sorted by (price, arrival_seq)
+        # in priority order, so the slot is found by binary search instead of a scan.
         if reverse:
-            # higher price first
-            while pos < len(book) and (
-                book[pos].price_cperkwh > key_price
-                or (
-                    book[pos].price_cperkwh == key_price
-                    and book[pos].arrival_seq < order.arrival_seq
-                )
-            ):
-                pos += 1
+            pos = bisect_left(
+                book,
+                (-order.price_cperkwh, order.arrival_seq),
+                key=lambda o: (-o.price_cperkwh, o.arrival_seq),
+            )
         else:
-            # lower price first
-            while pos < len(book) and (
-                book[pos].price_cperkwh < key_price
-                or (
-                    book[pos].price_cperkwh == key_price
-                    and book[pos].arrival_seq < order.arrival_seq
-                )
-            ):
-                pos += 1
+            pos = bisect_left(
+                book,
+                (order.price_cperkwh, order.arrival_seq),
+                key=lambda o: (o.price_cperkwh, o.arrival_seq),
+            )
         book.insert(pos, order)
+        return pos
 
     def _crossing(self) -> bool:
         return bool(
-            self.bids
-            and self.asks
-            and self.bids[0].price_cperkwh >= self.asks[0].price_cperkwh
+            self._bids
+            and self._asks
+            and self._bids[0].price_cperkwh >= self._asks[0].price_cperkwh
         )
 
     def _match(self, incoming: Order) -> list[Trade]:
+        # Most arrivals do not cross: answer those from the opposite best alone
+        if incoming.side == "buy":
+            if not self._asks or incoming.price_cperkwh < self._asks[0].price_cperkwh:
+                return []
+        elif not self._bids or incoming.price_cperkwh > self._bids[0].price_cperkwh:
+            return []
         trades: list[Trade] = []
         # Match against opposite book
         if incoming.side == "buy":
             # buy taker matches asks (makers) from lowest price
+            book = self._asks
+            filled = 0  # fully filled makers at the head, removed in one slice after the loop
             while (
                 incoming.qty_kwh > 0
-                and self.asks
-                and incoming.price_cperkwh >= self.asks[0].price_cperkwh
+                and filled < len(book)
+                and incoming.price_cperkwh >= book[filled].price_cperkwh
             ):
-                maker = self.asks[0]
+                maker = book[filled]
                 qty = min(incoming.qty_kwh, maker.qty_kwh)
                 price = maker.price_cperkwh  # maker-price rule
                 trades.append(
@@ -220,18 +444,24 @@ class OrderBook:
                     )
                 )
                 self._trades.append(trades[-1])
+                self._traded_kwh += qty
                 incoming.qty_kwh -= qty
-                maker.qty_kwh -= qty
-                if maker.qty_kwh <= 0:
-                    self.asks.pop(0)
+                left = maker.qty_kwh - qty
+                if left <= 0:
+                    filled += 1
+                else:
+                    book[filled] = _with_qty(maker, left)
+            del book[:filled]
         else:
             # sell taker matches bids (makers) from highest price
+            book = self._bids
+            filled = 0  # fully filled makers at the head, removed in one slice after the loop
             while (
                 incoming.qty_kwh > 0
-                and self.bids
-                and incoming.price_cperkwh <= self.bids[0].price_cperkwh
+                and filled < len(book)
+                and incoming.price_cperkwh <= book[filled].price_cperkwh
             ):
-                maker = self.bids[0]
+                maker = book[filled]
                 qty = min(incoming.qty_kwh, maker.qty_kwh)
                 price = maker.price_cperkwh  # maker-price rule
                 trades.append(
@@ -247,8 +477,29 @@ class OrderBook:
                     )
                 )
                 self._trades.append(trades[-1])
+                self._traded_kwh += qty
                 incoming.qty_kwh -= qty
-                maker.qty_kwh -= qty
-                if maker.qty_kwh <= 0:
-                    self.bids.pop(0)
+                left = maker.qty_kwh - qty
+                if left <= 0:
+                    filled += 1
+                else:
+                    book[filled] = _with_qty(maker, left)
+            del book[:filled]
+        if trades:
+            self._consume_columns("asks" if incoming.side == "buy" else "bids", trades)
         return trades
+
+    def _consume_columns(self, name: str, trades: list[Trade]) -> None:
+        """Advance the cached columns of side `name` past the makers hit by `trades`."""
+        cols = self._columns.get(name)
+        if cols is None:
+            return
+        book = self._bids if name == "bids" else self._asks
+        # Makers are consumed from the head; all but possibly the last are fully filled
+        partial = bool(book) and book[0].order_id == trades[-1].maker_order_id
+        filled = len(trades) - 1 if partial else len(trades)
+        prices, qtys, oids = cols.prices[filled:], cols.qtys[filled:], cols.oids[filled:]
+        if partial:
+            qtys = qtys.copy()
+            qtys[0] = book[0].qty_kwh
+        self._columns[name] = OrderColumns(prices, qtys, oids)
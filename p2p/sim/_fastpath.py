@@ -0,0 +1,74 @@
+"""Numeric kernel for the planner welfare bound over SoA (price, qty) columns.
+
+Compiled with Numba when the optional `opt` extra is installed; otherwise the same code runs
+as plain Python (no fastmath, so both paths produce identical floats).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    HAVE_NUMBA = False
+
+
+def _planner_greedy(
+    bid_prices: Sequence[float],
+    bid_qtys: Sequence[float],
+    ask_prices: Sequence[float],
+    ask_qtys: Sequence[float],
+    cap_kwh: float,
+    has_cap: bool,
+) -> tuple[float, float]:
+    """Greedy two-pointer match of bids (price desc) against asks (price asc).
+
+    Returns (quote welfare, traded kWh); `cap_kwh` bounds the traded total when `has_cap`.
+    The current bid/ask price and remaining qty live in locals, loaded once per order
+    and never written back, so the inputs (ndarrays, or plain lists for the interpreted
+    path) are left untouched.
+    """
+    nb = len(bid_prices)
+    na = len(ask_prices)
+    w_bound = 0.0
+    traded = 0.0
+    if nb == 0 or na == 0:
+        return w_bound, traded
+    i = 0
+    j = 0
+    bp = bid_prices[0]
+    bq = bid_qtys[0]
+    ap = ask_prices[0]
+    aq = ask_qtys[0]
+    while True:
+        if bp < ap:
+            break
+        qty = min(bq, aq)
+        if has_cap:
+            remaining = max(0.0, cap_kwh - traded)
+            if remaining <= 0.0:
+                break
+            qty = min(qty, remaining)
+        w_bound += (bp - ap) * qty
+        traded += qty
+        bq -= qty
+        aq -= qty
+        if bq <= 0:
+            i += 1
+            if i == nb:
+                break
+            bp = bid_prices[i]
+            bq = bid_qtys[i]
+        if aq <= 0:
+            j += 1
+            if j == na:
+                break
+            ap = ask_prices[j]
+            aq = ask_qtys[j]
+    return w_bound, traded
+
+
+planner_greedy = njit(cache=True)(_planner_greedy) if HAVE_NUMBA else _planner_greedy
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from .analysis import bootstrap_ci
@@ -15,14 +18,67 @@ def _read_json(path: str) -> dict[str, Any]:
         return json.load(f)
 
 
+try:
+    import pyarrow  # noqa: F401
+
+    _CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - pyarrow is optional
+    _CSV_ENGINE = "c"
+
+_INTERVAL_COLS = ["W", "W_hat"]
+_DECISION_COLS = ["agent_id", "agent_type", "wall_ms", "offers_seen", "solver_calls"]
+
+
+def _read_csv(path: str, usecols: list[str]) -> pd.DataFrame:
+    return pd.read_csv(path, usecols=usecols, engine=_CSV_ENGINE)
+
+
+def _file_key(path: str) -> tuple[int, int]:
+    """(st_mtime_ns, st_size) of `path`, or (-1, -1) when it can't be stat'ed.
+
+    Part of the CSV cache keys: a run directory rewritten in place (exp_runner reuses
+    per-cell paths) changes the key, so its means are recomputed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return -1, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _interval_means(interval_csv: str) -> tuple[float, float]:
+    """Return (w_hat_mean, W_mean) across intervals for a run, parsing the CSV once.
+
+    Using a mean (rather than sum) keeps runs comparable across different
+    interval lengths; ratios like R_W are invariant to the scale anyway.
+    Results are cached per (path, mtime, size), so a manifest shared by several reports
+    is read once.
+    """
+    return _interval_means_for(interval_csv, *_file_key(interval_csv))
+
+
+@functools.lru_cache(maxsize=4096)
+def _interval_means_for(interval_csv: str, mtime_ns: int, size: int) -> tuple[float, float]:
+    df = _read_csv(interval_csv, _INTERVAL_COLS)
+    if df.empty:
+        return float("nan"), float("nan")
+    return float(df["W_hat"].mean()), float(df["W"].mean())
+
+
 def _mean_wall_ms(dec_csv: str) -> tuple[float, float, float]:
     """Return (wall_ms_mean, offers_seen_mean, solver_calls_mean) from a decision CSV.
 
     Computes mean per-agent wall_ms across intervals, then averages across agents.
+    Cached like `_interval_means`.
     """
+    return _mean_wall_ms_for(dec_csv, *_file_key(dec_csv))
+
+
+@functools.lru_cache(maxsize=4096)
+def _mean_wall_ms_for(dec_csv: str, mtime_ns: int, size: int) -> tuple[float, float, float]:
     if not dec_csv or not os.path.exists(dec_csv):
         return float("nan"), float("nan"), float("nan")
-    df = pd.read_csv(dec_csv)
+    df = _read_csv(dec_csv, _DECISION_COLS)
     if df.empty:
         return float("nan"), float("nan"), float("nan")
     g = df.groupby(["agent_id", "agent_type"], as_index=False).agg(
@@ -37,91 +93,59 @@ def _mean_wall_ms(dec_csv: str) -> tuple[float, float, float]:
     )
 
 
-def _mean_w_hat(interval_csv: str) -> float:
-    df = pd.read_csv(interval_csv)
-    if df.empty:
-        return float("nan")
-    return float(df["W_hat"].mean())
-
-
-def _mean_w(interval_csv: str) -> float:
-    """Return mean quote-surplus welfare W across intervals for a run.
-
-    Using a mean (rather than sum) keeps runs comparable across different
-    interval lengths; ratios like R_W are invariant to the scale anyway.
-    """
-    df = pd.read_csv(interval_csv)
-    if df.empty:
-        return float("nan")
-    return float(df["W"].mean())
+def _run_means(run: dict[str, Any]) -> tuple[float, ...]:
+    """(w_hat, W, wall_ms, offers_seen, solver_calls) for one manifest run entry."""
+    return (
+        *_interval_means(run["interval_csv"]),
+        *_mean_wall_ms(run.get("decision_csv") or ""),
+    )
 
 
-def compute_runs_from_manifest(manifest_path: str) -> pd.DataFrame:
+def compute_runs_from_manifest(manifest_path: str, *, workers: int = 1) -> pd.DataFrame:
     """Return per-run metrics (no seed aggregation) from a manifest.
 
     Columns: N, agent, mode, tau, K, seed, w_hat, W, wall_ms, offers_seen, solver_calls.
+    With `workers > 1` the runs' CSVs are parsed in that many processes; the result is
+    the same, in manifest order.
     """
     man = _read_json(manifest_path)
     runs = man.get("runs", [])
-    rows: list[dict[str, Any]] = []
-    for r in runs:
-        w_hat = _mean_w_hat(r["interval_csv"])
-        w_mean = _mean_w(r["interval_csv"])
-        wall_ms, offers_seen, solver_calls = _mean_wall_ms(r.get("decision_csv") or "")
-        rows.append(
-            {
-                "N": r["N"],
-                "agent": r["agent"],
-                "mode": r.get("mode"),
-                "tau": r.get("tau"),
-                "K": r.get("K"),
-                "seed": r.get("seed"),
-                "w_hat": w_hat,
-                "W": w_mean,
-                "wall_ms": wall_ms,
-                "offers_seen": offers_seen,
-                "solver_calls": solver_calls,
-            }
-        )
-    return pd.DataFrame(rows)
-
-
-def compute_frontier_from_manifest(manifest_path: str) -> pd.DataFrame:
-    man = _read_json(manifest_path)
-    runs = man.get("runs", [])
-    rows = []
-    for r in runs:
-        w_hat = _mean_w_hat(r["interval_csv"])
-        wall_ms, offers_seen, solver_calls = _mean_wall_ms(r.get("decision_csv") or "")
-        rows.append(
-            {
-                "N": r["N"],
-                "agent": r["agent"],
-                "mode": r.get("mode"),
-                "tau": r.get("tau"),
-                "K": r.get("K"),
-                "seed": r.get("seed"),
-                "w_hat": w_hat,
-                "wall_ms": wall_ms,
-                "offers_seen": offers_seen,
-                "solver_calls": solver_calls,
-            }
-        )
-    df = pd.DataFrame(rows)
+    n = len(runs)
+    # Built column-wise: run metadata as lists (dtype inferred as for records), the
+    # per-run means straight into float arrays
+    meta: dict[str, list[Any]] = {k: [] for k in ("N", "agent", "mode", "tau", "K", "seed")}
+    metric_keys = ("w_hat", "W", "wall_ms", "offers_seen", "solver_calls")
+    metrics = {k: np.empty(n, dtype=np.float64) for k in metric_keys}
+    if workers > 1 and n > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            per_run = list(ex.map(_run_means, runs, chunksize=max(1, n // (4 * workers))))
+    else:
+        per_run = [_run_means(r) for r in runs]
+    for i, (r, values) in enumerate(zip(runs, per_run, strict=True)):
+        for k, col in meta.items():
+            col.append(r[k] if k in ("N", "agent") else r.get(k))
+        for k, v in zip(metric_keys, values, strict=True):
+            metrics[k][i] = v
+    return pd.DataFrame({**meta, **metrics})
+
+
+def compute_frontier_from_manifest(manifest_path: str, *, workers: int = 1) -> pd.DataFrame:
+    df = compute_runs_from_manifest(manifest_path, workers=workers).drop(columns="W")
     # Aggregate across seeds for each cell. Keep NaN groups (e.g., K=None in band mode).
     keys = ["N", "agent", "mode", "tau", "K"]
-    agg = df.groupby(keys, as_index=False, dropna=False, sort=True).agg(
+    gb = df.groupby(keys, as_index=False, dropna=False, sort=True)
+    agg = gb.agg(
         w_hat_mean=("w_hat", "mean"),
         wall_ms_mean=("wall_ms", "mean"),
         offers_seen_mean=("offers_seen", "mean"),
         solver_calls_mean=("solver_calls", "mean"),
         seeds=("seed", "nunique"),
     )
-    # Bootstrap CI for w_hat per cell in the same sorted order
+    # Bootstrap CI for w_hat per cell in the same sorted order (same grouping, w_hat only)
     ci_lo = []
     ci_hi = []
-    for _, group in df.groupby(keys, dropna=False, sort=True):
-        lo, hi = bootstrap_ci(group["w_hat"].dropna().tolist(), n_boot=1000)
+    for _, w_hat in gb["w_hat"]:
+        lo, hi = bootstrap_ci(w_hat.dropna().tolist(), n_boot=1000)
         ci_lo.append(lo)
         ci_hi.append(hi)
     agg["w_hat_lo"] = ci_lo
@@ -130,18 +154,26 @@ def compute_frontier_from_manifest(manifest_path: str) -> pd.DataFrame:
 
 
 def pareto_frontier(df: pd.DataFrame) -> pd.DataFrame:
-    """Return non-dominated points (maximize w_hat_mean, minimize wall_ms_mean)."""
-    pts = df[["w_hat_mean", "wall_ms_mean"]].values.tolist()
-    keep = [True] * len(pts)
-    for i, (w_i, c_i) in enumerate(pts):
-        if not keep[i]:
-            continue
-        for j, (w_j, c_j) in enumerate(pts):
-            if i == j:
-                continue
-            if (w_j >= w_i and c_j <= c_i) and (w_j > w_i or c_j < c_i):
-                keep[i] = False
-                break
+    """Return non-dominated points (maximize w_hat_mean, minimize wall_ms_mean).
+
+    Sort-then-sweep in O(n log n): order by ascending cost, then descending welfare; a
+    point is dominated iff a strictly cheaper point has welfare >= its own, or a point at
+    the same cost has strictly higher welfare. Exact duplicates are all kept and rows with
+    a NaN objective are never dominated, as in the pairwise definition; rows keep their order.
+    """
+    w = df["w_hat_mean"].to_numpy(dtype=float)
+    c = df["wall_ms_mean"].to_numpy(dtype=float)
+    keep = np.ones(len(df), dtype=bool)
+    idx = np.flatnonzero(~(np.isnan(w) | np.isnan(c)))
+    if idx.size:
+        order = idx[np.lexsort((-w[idx], c[idx]))]
+        ws, cs = w[order], c[order]
+        starts = np.r_[True, cs[1:] != cs[:-1]]
+        group = np.cumsum(starts) - 1
+        group_best = ws[starts]  # each cost group leads with its highest welfare
+        cheaper_best = np.r_[-np.inf, np.maximum.accumulate(group_best)[:-1]][group]
+        dominated = (ws < group_best[group]) | ((group > 0) & (ws <= cheaper_best))
+        keep[order[dominated]] = False
     return df[keep].copy()
 
 
@@ -172,10 +204,16 @@ def main() -> None:
             "Empty for global."
         ),
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to parse the runs' CSVs (1 = in-process)",
+    )
     args = p.parse_args()
 
     os.makedirs(args.out_dir, exist_ok=True)
-    frontier = compute_frontier_from_manifest(args.manifest)
+    frontier = compute_frontier_from_manifest(args.manifest, workers=args.workers)
     frontier.to_csv(os.path.join(args.out_dir, "frontier.csv"), index=False)
     # Global Pareto frontier across all cells
     pareto = pareto_frontier(frontier)
@@ -5,6 +5,8 @@ from collections.abc import Iterable
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
 
 def bootstrap_ci(
@@ -24,10 +26,9 @@ def bootstrap_ci(
         return (float("nan"), float("nan"))
     rng = np.random.default_rng(seed)
     n = arr.size
-    boots = np.empty(n_boot, dtype=float)
-    for i in range(n_boot):
-        idx = rng.integers(0, n, size=n)
-        boots[i] = arr[idx].mean()
+    # One (n_boot, n) draw consumes the stream exactly like n_boot draws of size n
+    idx = rng.integers(0, n, size=(n_boot, n))
+    boots = arr[idx].mean(axis=1)
     lo = float(np.quantile(boots, alpha / 2))
     hi = float(np.quantile(boots, 1 - alpha / 2))
     return lo, hi
@@ -44,61 +45,89 @@ def load_interval_metrics(path: str) -> pd.DataFrame:
     return df
 
 
-def plot_frontier(df: pd.DataFrame, agent_stats: pd.DataFrame, out_png: str) -> None:
+def _target_axes(ax: Axes | None, figsize: tuple[float, float]) -> tuple[Figure | None, Axes]:
+    """Return (own_figure, axes): `ax` itself, or a new figure's axes when `ax` is None."""
+    if ax is not None:
+        return None, ax
+    fig, new_ax = plt.subplots(figsize=figsize)
+    return fig, new_ax
+
+
+def _finish(fig: Figure | None, out_png: str | None) -> None:
+    """Save and close a figure created by `_target_axes`; caller-owned axes are left as is."""
+    if fig is None:
+        return
+    fig.tight_layout()
+    if out_png:
+        fig.savefig(out_png, dpi=150)
+    plt.close(fig)
+
+
+def plot_frontier(
+    df: pd.DataFrame,
+    agent_stats: pd.DataFrame,
+    out_png: str | None,
+    *,
+    ax: Axes | None = None,
+) -> None:
     """Plot welfare vs per-agent compute frontier.
 
     `agent_stats` should have columns: agent_id, agent_type, wall_ms (mean per step).
     `df` should include W_hat.
     This function produces a scatter; dominance filtering can be added upstream as needed.
+    Like the other `plot_*` helpers, it draws into `ax` when given (the caller saves that
+    figure) and otherwise writes its own figure to `out_png` and closes it.
     """
-    plt.figure(figsize=(6, 4))
+    fig, ax = _target_axes(ax, (6, 4))
     # Aggregate per run (mean W_hat) and per-agent compute
     w_hat = df["W_hat"].mean()
     comp = agent_stats.groupby("agent_type")["wall_ms"].mean()
     for atype, ms in comp.items():
-        plt.scatter(ms, w_hat, label=atype)
-    plt.xlabel("Per-agent wall time (ms)")
-    plt.ylabel("Normalized welfare Ŵ")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=150)
+        ax.scatter(ms, w_hat, label=atype)
+    ax.set_xlabel("Per-agent wall time (ms)")
+    ax.set_ylabel("Normalized welfare Ŵ")
+    ax.legend()
+    _finish(fig, out_png)
 
 
-def plot_scaling(agent_stats_by_n: pd.DataFrame, out_png: str) -> None:
+def plot_scaling(
+    agent_stats_by_n: pd.DataFrame, out_png: str | None, *, ax: Axes | None = None
+) -> None:
     """Plot per-agent wall time vs N (scaling). Expects columns: N, agent_type, wall_ms."""
-    plt.figure(figsize=(6, 4))
+    fig, ax = _target_axes(ax, (6, 4))
     for atype, g in agent_stats_by_n.groupby("agent_type"):
         g = g.sort_values("N")
-        plt.plot(g["N"], g["wall_ms"], marker="o", label=atype)
-    plt.xlabel("N agents")
-    plt.ylabel("Per-agent wall time (ms)")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=150)
+        ax.plot(g["N"], g["wall_ms"], marker="o", label=atype)
+    ax.set_xlabel("N agents")
+    ax.set_ylabel("Per-agent wall time (ms)")
+    ax.legend()
+    _finish(fig, out_png)
 
 
-def plot_welfare_heatmap(df: pd.DataFrame, out_png: str) -> None:
+def plot_welfare_heatmap(df: pd.DataFrame, out_png: str | None, *, ax: Axes | None = None) -> None:
     """Plot a heatmap of W_hat by (tau, K). Expects columns: tau, K, W_hat."""
-    pivot = df.pivot_table(index="tau", columns="K", values="W_hat", aggfunc="mean")
-    plt.figure(figsize=(6, 4))
-    im = plt.imshow(pivot.values, aspect="auto", origin="lower", cmap="viridis")
-    plt.colorbar(im, label="Ŵ")
-    plt.xticks(range(len(pivot.columns)), pivot.columns)
-    plt.yticks(range(len(pivot.index)), pivot.index)
-    plt.xlabel("K")
-    plt.ylabel("tau (%)")
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=150)
-
-
-def plot_price_volatility(df: pd.DataFrame, out_png: str) -> None:
+    # Plain groupby-mean + unstack: same grid as pivot_table without its generic machinery.
+    # Dropping NaN cells first mirrors its dropna=True (no all-NaN tau rows or K columns).
+    pivot = df.groupby(["tau", "K"])["W_hat"].mean().dropna().unstack("K")
+    fig, ax = _target_axes(ax, (6, 4))
+    im = ax.imshow(pivot.values, aspect="auto", origin="lower", cmap="viridis")
+    ax.figure.colorbar(im, ax=ax, label="Ŵ")
+    ax.set_xticks(range(len(pivot.columns)), pivot.columns)
+    ax.set_yticks(range(len(pivot.index)), pivot.index)
+    ax.set_xlabel("K")
+    ax.set_ylabel("tau (%)")
+    _finish(fig, out_png)
+
+
+def plot_price_volatility(
+    df: pd.DataFrame, out_png: str | None, *, ax: Axes | None = None
+) -> None:
     """Plot price variance vs t from interval-metrics DataFrame."""
-    plt.figure(figsize=(6, 3.5))
-    plt.plot(df["t"], df["price_var"], marker=".")
-    plt.xlabel("Interval t")
-    plt.ylabel("Price variance")
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=150)
+    fig, ax = _target_axes(ax, (6, 3.5))
+    ax.plot(df["t"], df["price_var"], marker=".")
+    ax.set_xlabel("Interval t")
+    ax.set_ylabel("Price variance")
+    _finish(fig, out_png)
 
 
 def load_decision_metrics(path: str) -> pd.DataFrame:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import os
 
+import matplotlib
 import pandas as pd
 
 from .analysis import (
@@ -24,6 +25,8 @@ def main() -> None:
     p.add_argument("--scaling-csv", help="Optional CSV with columns: N, agent_type, wall_ms")
     p.add_argument("--welfare-grid-csv", help="Optional CSV with columns: tau, K, W_hat")
     args = p.parse_args()
+    # Files only: skip interactive backend discovery
+    matplotlib.use("Agg")
 
     os.makedirs(args.out_dir, exist_ok=True)
 
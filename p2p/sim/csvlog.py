@@ -0,0 +1,20 @@
+"""Layout of the per-interval and per-decision CSV logs written by `run` and `exp_runner`.
+
+Each row is formatted with one call per record into the text csv.writer produced for these
+plain fields (no quoting needed, CRLF line ends); a missing price/qty is passed as "".
+"""
+
+from __future__ import annotations
+
+INTERVAL_HEADER = (
+    "t,trades,traded_kwh,posted_buy_kwh,posted_sell_kwh,unserved_kwh,"
+    "curtailment_kwh,price_mean,price_var,W,W_bound,W_hat\r\n"
+)
+# All-numeric, so printf-style %, which is cheaper than str.format for it
+INTERVAL_FMT = "%d,%d,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f\r\n"
+
+DECISION_HEADER = (
+    "run_id,t,agent_id,agent_type,action_type,price_cperkwh,"
+    "qty_kwh,offers_seen,solver_calls,learners_steps,wall_ms,mem_mb\r\n"
+)
+DECISION_FMT = "{},{},{},{},{},{},{},{},{},{},{:.3f},{:.2f}\r\n"
@@ -1,23 +1,33 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import json
 import os
 import platform
 import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Any, cast
+from itertools import cycle, islice
+from typing import Any, TextIO, cast
 
+from ..agents.learner import NoRegretLearner
 from ..agents.optimizer import Mode as OptMode
 from ..agents.optimizer import Optimizer
+from ..agents.prosumer import Decision, Prosumer
 from ..agents.satisficer import Mode as SatMode
 from ..agents.satisficer import Satisficer
 from ..agents.zi import ZIConstrained
 from ..market.clearing import step_interval, step_interval_call
 from ..market.order_book import OrderBook
-from .metrics import compute_quote_welfare, planner_bound_quote_welfare
-from .profiling import process_mem_mb
+from .csvlog import DECISION_FMT, DECISION_HEADER, INTERVAL_FMT, INTERVAL_HEADER
+from .metrics import (
+    compute_quote_welfare,
+    planner_bound_from_columns,
+    trade_price_stats,
+)
+from .profiling import MEM_SAMPLE_INTERVALS, process_mem_mb
 
 
 def parse_int_list(arg: str) -> list[int]:
@@ -28,6 +38,17 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+# Intervals of CSV lines buffered per write() in run_cell
+_CSV_BATCH_INTERVALS = 100
+# Buffer size of run_cell's CSV files
+_CSV_BUFFER_BYTES = 1 << 20
+
+
+def _flush_lines(f: TextIO, lines: list[str]) -> None:
+    f.write("".join(lines))
+    lines.clear()
+
+
 def build_agents(
     agent: str,
     n: int,
@@ -42,73 +63,194 @@ def build_agents(
     optimizer_mode: str | None = None,
     hetero_tau: list[int] | None = None,
     hetero_k: list[int] | None = None,
-) -> list:
-    agents: list = []
-    for i in range(n):
-        aseed = (seed * 1000003 + i) & 0x7FFFFFFF
-        aid = f"{agent}_{i}"
-        if agent == "optimizer":
-            agents.append(
-                Optimizer(
+) -> list[Prosumer]:
+    # agent/mode are fixed per call: validate and pick the constructor once, then build
+    sigma = price_sigma or 0.5
+    make: Callable[[int, int, str], Prosumer]
+    if agent == "optimizer":
+        opt_mode = cast(OptMode, optimizer_mode or "greedy")
+
+        def make(i: int, aseed: int, aid: str) -> Prosumer:
+            return Optimizer(
+                agent_id=aid,
+                seed=aseed,
+                mode=opt_mode,
+                quote_sigma_cents=sigma,
+                buy_markup_cents=buy_markup,
+                sell_discount_cents=sell_discount,
+            )
+
+    elif agent == "satisficer":
+        if not mode:
+            raise ValueError("mode is required for satisficer: band|k_search|k_greedy")
+        if mode == "band":
+            if tau is None and not hetero_tau:
+                raise ValueError("tau or --hetero-tau must be provided for mode=band")
+            # Per-agent tau, cycling through the heterogeneous values
+            tau_seq = [float(x) for x in islice(cycle(hetero_tau or [tau or 5]), n)]
+
+            def make(i: int, aseed: int, aid: str) -> Prosumer:
+                return Satisficer(
                     agent_id=aid,
                     seed=aseed,
-                    mode=cast(OptMode, optimizer_mode or "greedy"),
-                    quote_sigma_cents=price_sigma or 0.5,
+                    mode="band",
+                    tau_percent=tau_seq[i],
+                    quote_sigma_cents=sigma,
                     buy_markup_cents=buy_markup,
                     sell_discount_cents=sell_discount,
                 )
-            )
-        elif agent == "satisficer":
-            if not mode:
-                raise ValueError("mode is required for satisficer: band|k_search|k_greedy")
-            if mode == "band":
-                if tau is None and not hetero_tau:
-                    raise ValueError("tau or --hetero-tau must be provided for mode=band")
-                agents.append(
-                    Satisficer(
-                        agent_id=aid,
-                        seed=aseed,
-                        mode="band",
-                        tau_percent=float(
-                            hetero_tau[(i % len(hetero_tau))] if hetero_tau else (tau or 5)
-                        ),
-                        quote_sigma_cents=price_sigma or 0.5,
-                        buy_markup_cents=buy_markup,
-                        sell_discount_cents=sell_discount,
-                    )
-                )
-            elif mode in ("k_search", "k_greedy"):
-                if k is None and not hetero_k:
-                    raise ValueError("K or --hetero-K must be provided for mode=k_search/k_greedy")
-                agents.append(
-                    Satisficer(
-                        agent_id=aid,
-                        seed=aseed,
-                        mode=cast(SatMode, mode),
-                        k_max=int(hetero_k[(i % len(hetero_k))] if hetero_k else (k or 1)),
-                        quote_sigma_cents=price_sigma or 0.5,
-                        buy_markup_cents=buy_markup,
-                        sell_discount_cents=sell_discount,
-                    )
-                )
-            else:
-                raise ValueError(f"unknown mode: {mode}")
-        elif agent == "zi":
-            agents.append(ZIConstrained(agent_id=aid))
-        elif agent == "learner":
-            from ..agents.learner import NoRegretLearner
-            agents.append(
-                NoRegretLearner(
+
+        elif mode in ("k_search", "k_greedy"):
+            if k is None and not hetero_k:
+                raise ValueError("K or --hetero-K must be provided for mode=k_search/k_greedy")
+            sat_mode = cast(SatMode, mode)
+            k_seq = [int(x) for x in islice(cycle(hetero_k or [k or 1]), n)]
+
+            def make(i: int, aseed: int, aid: str) -> Prosumer:
+                return Satisficer(
                     agent_id=aid,
                     seed=aseed,
-                    quote_sigma_cents=price_sigma or 0.5,
+                    mode=sat_mode,
+                    k_max=k_seq[i],
+                    quote_sigma_cents=sigma,
                     buy_markup_cents=buy_markup,
                     sell_discount_cents=sell_discount,
                 )
+
+        else:
+            raise ValueError(f"unknown mode: {mode}")
+    elif agent == "zi":
+
+        def make(i: int, aseed: int, aid: str) -> Prosumer:
+            return ZIConstrained(agent_id=aid)
+
+    elif agent == "learner":
+
+        def make(i: int, aseed: int, aid: str) -> Prosumer:
+            return NoRegretLearner(
+                agent_id=aid,
+                seed=aseed,
+                quote_sigma_cents=sigma,
+                buy_markup_cents=buy_markup,
+                sell_discount_cents=sell_discount,
             )
+
+    else:
+        raise ValueError(f"unknown agent type: {agent}")
+    return [make(i, (seed * 1000003 + i) & 0x7FFFFFFF, f"{agent}_{i}") for i in range(n)]
+
+
+def _run_loop(
+    agents: list[Prosumer],
+    ob: OrderBook,
+    intervals: int,
+    *,
+    mechanism: str,
+    info_set: str,
+    feeder_cap: float | None,
+    iw: TextIO,
+    dw: TextIO | None,
+) -> tuple[float, float]:
+    """Step the market `intervals` times, writing one row per interval to `iw` and, when
+    `dw` is given, one row per agent decision to it. Returns (posted kWh, traded kWh)."""
+    interval_rows: list[str] = []
+    decision_rows: list[str] = []
+    total_posted = 0.0
+    total_traded = 0.0
+    mem_mb = 0.0
+
+    # Decision logger writes one row per agent; reads the current t and memory sample.
+    def log_decision(a: Any, act: Decision | dict[str, Any] | Any, wall_ms: float) -> None:
+        d = Decision.of(act)
+        if d is not None:
+            action_type = d.type
+            offers_seen = int(d.offers_seen)
+            solver_calls = int(d.solver_calls)
+            learners_steps = int(d.learners_steps)
+            price = d.price
+            qty = d.qty_kwh
         else:
-            raise ValueError(f"unknown agent type: {agent}")
-    return agents
+            action_type = "none"
+            offers_seen = 0
+            solver_calls = 0
+            learners_steps = 0
+            price = None
+            qty = None
+        decision_rows.append(
+            DECISION_FMT.format(
+                "cell",
+                t,
+                a.agent_id,
+                a.__class__.__name__,
+                action_type,
+                "" if price is None else price,
+                "" if qty is None else qty,
+                offers_seen,
+                solver_calls,
+                learners_steps,
+                wall_ms,
+                mem_mb,
+            )
+        )
+
+    logger = log_decision if dw is not None else None
+    for t in range(intervals):
+        # Periodic memory sample for decision logging (reused between samples)
+        if dw is not None and t % MEM_SAMPLE_INTERVALS == 0:
+            mem_mb = process_mem_mb()
+        if mechanism == "call":
+            result = step_interval_call(
+                t=t,
+                agents=agents,
+                ob=ob,
+                info_set=info_set,
+                decision_logger=logger,
+                feeder_limit_kw=feeder_cap,
+            )
+        else:
+            result = step_interval(
+                t=t, agents=agents, ob=ob, info_set=info_set, decision_logger=logger
+            )
+        # Result fields read more than once are bound to locals
+        traded = result.traded_kwh
+        posted_buy = result.posted_buy_kwh
+        posted_sell = result.posted_sell_kwh
+        trades_detail = result.trades_detail
+        total_posted += result.posted_kwh
+        total_traded += traded
+        price_mean, price_var = trade_price_stats(trades_detail)
+        welfare = compute_quote_welfare(trades_detail)
+        w_bound, _ = planner_bound_from_columns(
+            bids=result.bid_columns, asks=result.ask_columns, feeder_limit_kw=feeder_cap
+        )
+        w_hat = (welfare / w_bound) if w_bound > 0 else 0.0
+        unserved = max(0.0, posted_buy - traded)
+        curtail = max(0.0, posted_sell - traded)
+        interval_rows.append(
+            INTERVAL_FMT
+            % (
+                t,
+                result.trades,
+                traded,
+                posted_buy,
+                posted_sell,
+                unserved,
+                curtail,
+                price_mean,
+                price_var,
+                welfare,
+                w_bound,
+                w_hat,
+            )
+        )
+        if (t + 1) % _CSV_BATCH_INTERVALS == 0:
+            _flush_lines(iw, interval_rows)
+            if dw is not None:
+                _flush_lines(dw, decision_rows)
+    _flush_lines(iw, interval_rows)
+    if dw is not None:
+        _flush_lines(dw, decision_rows)
+    return total_posted, total_traded
 
 
 def run_cell(
@@ -160,186 +302,30 @@ def run_cell(
         f"decision_metrics_N{n}_{agent}_{mode or 'na'}_tau{tau}_K{k}_s{seed}.csv",
     )
 
-    total_posted = 0.0
-    total_traded = 0.0
-    with open(interval_path, mode="w", newline="") as iw:
-        iwriter = csv.writer(iw)
-        iwriter.writerow(
-            [
-                "t",
-                "trades",
-                "traded_kwh",
-                "posted_buy_kwh",
-                "posted_sell_kwh",
-                "unserved_kwh",
-                "curtailment_kwh",
-                "price_mean",
-                "price_var",
-                "W",
-                "W_bound",
-                "W_hat",
-            ]
+    # CSV lines are formatted directly (the fields never need quoting), buffered and
+    # written every _CSV_BATCH_INTERVALS intervals
+    with ExitStack() as stack:
+        iw = stack.enter_context(
+            open(interval_path, mode="w", newline="", buffering=_CSV_BUFFER_BYTES)
         )
+        iw.write(INTERVAL_HEADER)
+        dw: TextIO | None = None
         if instrument_decisions:
-            with open(dec_path, mode="w", newline="") as dw:
-                dwriter = csv.writer(dw)
-                dwriter.writerow(
-                    [
-                        "run_id",
-                        "t",
-                        "agent_id",
-                        "agent_type",
-                        "action_type",
-                        "price_cperkwh",
-                        "qty_kwh",
-                        "offers_seen",
-                        "solver_calls",
-                        "learners_steps",
-                        "wall_ms",
-                        "mem_mb",
-                    ]
-                )
-                for t in range(intervals):
-                    # Per-interval memory sample for logging
-                    mem_mb = process_mem_mb()
-                    # Decision logger closure writes one row per agent.
-                    # Bind loop variables (t, mem_mb) to avoid late-binding warnings (B023).
-                    def log_decision(
-                        a: Any,
-                        act: dict[str, Any] | Any,
-                        wall_ms: float,
-                        *,
-                        t_bound: int = t,
-                        mem_mb_bound: float = mem_mb,
-                    ) -> None:
-                        if isinstance(act, dict):
-                            action_type = str(act.get("type", "none"))
-                            offers_seen = int(act.get("offers_seen", 0))
-                            solver_calls = int(act.get("solver_calls", 0))
-                            learners_steps = int(act.get("learners_steps", 0))
-                            price = act.get("price")
-                            qty = act.get("qty_kwh")
-                        else:
-                            action_type = "none"
-                            offers_seen = 0
-                            solver_calls = 0
-                            learners_steps = 0
-                            price = None
-                            qty = None
-                        dwriter.writerow(
-                            [
-                                "cell",
-                                t_bound,
-                                a.agent_id,
-                                a.__class__.__name__,
-                                action_type,
-                                price,
-                                qty,
-                                offers_seen,
-                                solver_calls,
-                                learners_steps,
-                                f"{wall_ms:.3f}",
-                                f"{mem_mb_bound:.2f}",
-                            ]
-                        )
-                    # Market step using single-timed decisions
-                    if mechanism == "call":
-                        result = step_interval_call(
-                            t=t,
-                            agents=agents,
-                            ob=ob,
-                            info_set=info_set,
-                            decision_logger=log_decision,
-                            feeder_limit_kw=feeder_cap,
-                        )
-                    else:
-                        result = step_interval(
-                            t=t,
-                            agents=agents,
-                            ob=ob,
-                            info_set=info_set,
-                            decision_logger=log_decision,
-                        )
-                    total_posted += result.posted_kwh
-                    total_traded += result.traded_kwh
-                    prices = [tr.price_cperkwh for tr in result.trades_detail]
-                    price_mean = sum(prices) / len(prices) if prices else 0.0
-                    price_var = (
-                        sum((p - price_mean) ** 2 for p in prices) / len(prices) if prices else 0.0
-                    )
-                    welfare = compute_quote_welfare(result.trades_detail)
-                    bids_union = result.book_bids_start + result.posted_bids
-                    asks_union = result.book_asks_start + result.posted_asks
-                    w_bound, _ = planner_bound_quote_welfare(
-                        bids=bids_union,
-                        asks=asks_union,
-                        feeder_limit_kw=feeder_cap,
-                    )
-                    w_hat = (welfare / w_bound) if w_bound > 0 else 0.0
-                    unserved = max(0.0, result.posted_buy_kwh - result.traded_kwh)
-                    curtail = max(0.0, result.posted_sell_kwh - result.traded_kwh)
-                    iwriter.writerow(
-                        [
-                            t,
-                            result.trades,
-                            f"{result.traded_kwh:.6f}",
-                            f"{result.posted_buy_kwh:.6f}",
-                            f"{result.posted_sell_kwh:.6f}",
-                            f"{unserved:.6f}",
-                            f"{curtail:.6f}",
-                            f"{price_mean:.6f}",
-                            f"{price_var:.6f}",
-                            f"{welfare:.6f}",
-                            f"{w_bound:.6f}",
-                            f"{w_hat:.6f}",
-                        ]
-                    )
-        else:
-            for t in range(intervals):
-                if mechanism == "call":
-                    result = step_interval_call(
-                        t=t,
-                        agents=agents,
-                        ob=ob,
-                        info_set=info_set,
-                        feeder_limit_kw=feeder_cap,
-                    )
-                else:
-                    result = step_interval(t=t, agents=agents, ob=ob, info_set=info_set)
-                total_posted += result.posted_kwh
-                total_traded += result.traded_kwh
-                prices = [tr.price_cperkwh for tr in result.trades_detail]
-                price_mean = sum(prices) / len(prices) if prices else 0.0
-                price_var = (
-                    sum((p - price_mean) ** 2 for p in prices) / len(prices) if prices else 0.0
-                )
-                welfare = compute_quote_welfare(result.trades_detail)
-                bids_union = result.book_bids_start + result.posted_bids
-                asks_union = result.book_asks_start + result.posted_asks
-                w_bound, _ = planner_bound_quote_welfare(
-                    bids=bids_union, asks=asks_union, feeder_limit_kw=feeder_cap
-                )
-                w_hat = (welfare / w_bound) if w_bound > 0 else 0.0
-                unserved = max(0.0, result.posted_buy_kwh - result.traded_kwh)
-                curtail = max(0.0, result.posted_sell_kwh - result.traded_kwh)
-                iwriter.writerow(
-                    [
-                        t,
-                        result.trades,
-                        f"{result.traded_kwh:.6f}",
-                        f"{result.posted_buy_kwh:.6f}",
-                        f"{result.posted_sell_kwh:.6f}",
-                        f"{unserved:.6f}",
-                        f"{curtail:.6f}",
-                        f"{price_mean:.6f}",
-                        f"{price_var:.6f}",
-                        f"{welfare:.6f}",
-                        f"{w_bound:.6f}",
-                        f"{w_hat:.6f}",
-                    ]
-                )
+            dw = stack.enter_context(
+                open(dec_path, mode="w", newline="", buffering=_CSV_BUFFER_BYTES)
+            )
+            dw.write(DECISION_HEADER)
+        total_posted, total_traded = _run_loop(
+            agents,
+            ob,
+            intervals,
+            mechanism=mechanism,
+            info_set=info_set,
+            feeder_cap=feeder_cap,
+            iw=iw,
+            dw=dw,
+        )
 
-    # Aggregate per-run
     agg = {
         "N": n,
         "agent": agent,
@@ -426,6 +412,15 @@ def main() -> None:
         default="greedy",
         help="Optimizer decision mode",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Cells run in parallel processes (default 1; parallel cells contend for cores, "
+            "so keep 1 when wall_ms is the measurement)"
+        ),
+    )
     args = p.parse_args()
 
     ns = parse_int_list(args.N)
@@ -453,7 +448,7 @@ def main() -> None:
         # Optimizer/zi: grid of (n, None, None)
         grid = [(n, None, None) for n in ns]
 
-    runs: list[dict[str, Any]] = []
+    jobs: list[dict[str, Any]] = []
     for (n, tau, k) in grid:
         for s in range(args.seeds):
             seed = 1000 + s
@@ -462,27 +457,38 @@ def main() -> None:
                 f"N{n}_{args.agent}_{args.mode or 'na'}_tau{tau}_K{k}_s{seed}",
             )
             ensure_dir(cell_dir)
-            agg = run_cell(
-                n=n,
-                agent=args.agent,
-                mode=args.mode,
-                tau=tau,
-                k=k,
-                intervals=args.intervals,
-                seed=seed,
-                instrument_decisions=args.instrument_decisions,
-                out_dir=cell_dir,
-                price_sigma=args.price_sigma,
-                buy_markup=args.buy_markup,
-                sell_discount=args.sell_discount,
-                optimizer_mode=(args.optimizer_mode if args.agent == "optimizer" else None),
-                mechanism=args.mechanism,
-                feeder_cap=args.feeder_cap,
-                info_set=args.info_set,
-                hetero_tau=hetero_tau,
-                hetero_k=hetero_k,
+            jobs.append(
+                {
+                    "n": n,
+                    "agent": args.agent,
+                    "mode": args.mode,
+                    "tau": tau,
+                    "k": k,
+                    "intervals": args.intervals,
+                    "seed": seed,
+                    "instrument_decisions": args.instrument_decisions,
+                    "out_dir": cell_dir,
+                    "price_sigma": args.price_sigma,
+                    "buy_markup": args.buy_markup,
+                    "sell_discount": args.sell_discount,
+                    "optimizer_mode": (
+                        args.optimizer_mode if args.agent == "optimizer" else None
+                    ),
+                    "mechanism": args.mechanism,
+                    "feeder_cap": args.feeder_cap,
+                    "info_set": args.info_set,
+                    "hetero_tau": hetero_tau,
+                    "hetero_k": hetero_k,
+                }
             )
-            runs.append(agg)
+
+    # Cells are independent (own book, agents and cell_dir); the manifest keeps grid order
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            futures = [ex.submit(run_cell, **kw) for kw in jobs]
+            runs = [f.result() for f in futures]
+    else:
+        runs = [run_cell(**kw) for kw in jobs]
 
     write_manifest(args.out, vars(args), runs)
     print(f"Wrote manifest and {len(runs)} runs to {args.out}")
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any
 
-from ..market.order_book import Order
+import numpy as np
+
+from ..market.order_book import Order, OrderColumns, order_columns
 from ..market.order_book import Trade as TradeRec
+from ._fastpath import HAVE_NUMBA, planner_greedy
 
 
 @dataclass
@@ -26,14 +30,26 @@ def compute_quote_welfare(trades: Iterable[TradeRec]) -> float:
     return w
 
 
-def _as_price_qty(items: Iterable[Order], side: str) -> list[tuple[float, float]]:
-    out: list[tuple[float, float]] = []
-    for o in items:
-        if side == "buy":
-            out.append((o.price_cperkwh, o.qty_kwh))
-        else:
-            out.append((o.price_cperkwh, o.qty_kwh))
-    return out
+def trade_price_stats(trades: Sequence[TradeRec]) -> tuple[float, float]:
+    """Return (mean, population variance) of trade prices; (0.0, 0.0) without trades.
+
+    Plain left-to-right sums: for the handful of trades in an interval this is several
+    times cheaper than a NumPy round trip, and it keeps the logged values stable. Two
+    passes over the trades (no price list); the variance is taken about the mean, since
+    the one-pass sum-of-squares form loses digits to cancellation.
+    """
+    if not trades:
+        return 0.0, 0.0
+    n = len(trades)
+    total = 0.0
+    for tr in trades:
+        total += tr.price_cperkwh
+    mean = total / n
+    sq = 0.0
+    for tr in trades:
+        d = tr.price_cperkwh - mean
+        sq += d * d
+    return mean, sq / n
 
 
 def planner_bound_quote_welfare(
@@ -50,39 +66,35 @@ def planner_bound_quote_welfare(
     - Optional feeder_limit_kw adds an overall energy cap per interval of feeder_limit_kw * dt_h.
     Returns (welfare_bound, traded_kwh_bound).
     """
-    bid_list = sorted(_as_price_qty(bids, "buy"), key=lambda x: -x[0])
-    ask_list = sorted(_as_price_qty(asks, "sell"), key=lambda x: x[0])
-    i = 0
-    j = 0
-    w_bound = 0.0
-    traded = 0.0
-    energy_cap = None
-    if feeder_limit_kw is not None:
-        energy_cap = feeder_limit_kw * (step_min / 60.0)
-
-    while i < len(bid_list) and j < len(ask_list):
-        bp, bq = bid_list[i]
-        ap, aq = ask_list[j]
-        if bp < ap:
-            break
-        # feasible trade
-        qty = min(bq, aq)
-        if energy_cap is not None:
-            remaining = max(0.0, energy_cap - traded)
-            if remaining <= 0.0:
-                break
-            qty = min(qty, remaining)
-        w_bound += (bp - ap) * qty
-        traded += qty
-        bq -= qty
-        aq -= qty
-        if bq <= 0:
-            i += 1
-        else:
-            bid_list[i] = (bp, bq)
-        if aq <= 0:
-            j += 1
-        else:
-            ask_list[j] = (ap, aq)
-
-    return w_bound, traded
+    return planner_bound_from_columns(
+        bids=order_columns(bids if isinstance(bids, Sequence) else list(bids)),
+        asks=order_columns(asks if isinstance(asks, Sequence) else list(asks)),
+        feeder_limit_kw=feeder_limit_kw,
+        step_min=step_min,
+    )
+
+
+def planner_bound_from_columns(
+    *,
+    bids: OrderColumns,
+    asks: OrderColumns,
+    feeder_limit_kw: float | None = None,
+    step_min: int = 5,
+) -> tuple[float, float]:
+    """`planner_bound_quote_welfare` over SoA columns (e.g. `ClearingResult.bid_columns`).
+
+    The sorts are stable (equal prices keep input order) and the merge runs in the
+    `planner_greedy` kernel.
+    """
+    order = np.argsort(-bids.prices, kind="stable")
+    bid_prices, bid_qtys = bids.prices[order], bids.qtys[order]
+    order = np.argsort(asks.prices, kind="stable")
+    ask_prices, ask_qtys = asks.prices[order], asks.qtys[order]
+    has_cap = feeder_limit_kw is not None
+    energy_cap = feeder_limit_kw * (step_min / 60.0) if feeder_limit_kw is not None else 0.0
+    cols: tuple[Any, Any, Any, Any] = (bid_prices, bid_qtys, ask_prices, ask_qtys)
+    if not HAVE_NUMBA:
+        # Interpreted kernel: Python floats index far faster than NumPy scalars
+        cols = (bid_prices.tolist(), bid_qtys.tolist(), ask_prices.tolist(), ask_qtys.tolist())
+    w_bound, traded = planner_greedy(*cols, energy_cap, has_cap)
+    return float(w_bound), float(traded)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 
 import pandas as pd
 
 from .aggregate import (
+    _file_key,
     compute_frontier_from_manifest,
     compute_runs_from_manifest,
     grouped_pareto,
@@ -18,15 +20,29 @@ def _split_csv_arg(arg: str | None) -> list[str]:
     return [s for s in (x.strip() for x in arg.split(",")) if s]
 
 
+# Aggregated frames per (manifest path, mtime, size): repeated overlays of the same manifest
+# reuse them. A sweep rewrites its manifest, which changes the key, and the run CSVs it
+# lists are re-read because aggregate keys its CSV caches on their own file stats.
+# Callers must not mutate the frames.
+@functools.lru_cache(maxsize=32)
+def _frontier_for(manifest_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    return compute_frontier_from_manifest(manifest_path)
+
+
+@functools.lru_cache(maxsize=32)
+def _runs_for(manifest_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    return compute_runs_from_manifest(manifest_path)
+
+
 def combine_frontiers(manifests: list[str], labels: list[str] | None = None) -> pd.DataFrame:
     rows: list[pd.DataFrame] = []
     labels = labels or []
     if labels and len(labels) != len(manifests):
         raise SystemExit("--labels must match number of --manifests (or omit labels)")
     for i, m in enumerate(manifests):
-        df = compute_frontier_from_manifest(m)
-        df["label"] = labels[i] if labels else os.path.basename(os.path.dirname(m)) or f"m{i}"
-        rows.append(df)
+        df = _frontier_for(m, *_file_key(m))
+        label = labels[i] if labels else os.path.basename(os.path.dirname(m)) or f"m{i}"
+        rows.append(df.assign(label=label))
     if not rows:
         return pd.DataFrame()
     return pd.concat(rows, ignore_index=True)
@@ -38,9 +54,9 @@ def combine_runs(manifests: list[str], labels: list[str] | None = None) -> pd.Da
     if labels and len(labels) != len(manifests):
         raise SystemExit("--labels must match number of --manifests (or omit labels)")
     for i, m in enumerate(manifests):
-        df = compute_runs_from_manifest(m)
-        df["label"] = labels[i] if labels else os.path.basename(os.path.dirname(m)) or f"m{i}"
-        rows.append(df)
+        df = _runs_for(m, *_file_key(m))
+        label = labels[i] if labels else os.path.basename(os.path.dirname(m)) or f"m{i}"
+        rows.append(df.assign(label=label))
     if not rows:
         return pd.DataFrame()
     return pd.concat(rows, ignore_index=True)
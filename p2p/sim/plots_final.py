@@ -1,21 +1,65 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
+from .aggregate import _file_key
 from .analysis import bootstrap_ci
 
+try:
+    import pyarrow  # noqa: F401
+
+    _CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - pyarrow is optional
+    _CSV_ENGINE = "c"
+
+# Columns of the combined runs CSV that the ratio/connector figures read
+_RUNS_COLS = ["N", "agent", "mode", "tau", "K", "seed", "w_hat", "W", "wall_ms", "label"]
+
 
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def _best_effort(name: str, fn: Callable[..., None], *args: Any) -> None:
+    """Run one figure's `fn`, logging instead of raising when it fails."""
+    try:
+        fn(*args)
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Could not generate %s: %s", name, exc)
+
+
+def _mean_by_key(keys: np.ndarray, *values: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Sorted unique `keys` and the per-key mean of each of `values`, skipping NaN like
+    pandas' groupby mean (all-NaN groups give NaN); bincount over the inverse index."""
+    uniq, inv = np.unique(keys, return_inverse=True)
+    out = [uniq]
+    for v in values:
+        ok = ~np.isnan(v)
+        sums = np.bincount(inv[ok], weights=v[ok], minlength=uniq.size)
+        counts = np.bincount(inv[ok], minlength=uniq.size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out.append(sums / counts)
+    return tuple(out)
+
+
 def plot_frontier_overlay_cda(overlay_csv: str, out_png: str) -> None:
-    df = pd.read_csv(overlay_csv)
+    plot_frontier_overlay_cda_from_df(pd.read_csv(overlay_csv), out_png)
+
+
+def plot_frontier_overlay_cda_from_df(df: pd.DataFrame, out_png: str) -> None:
     # Expect columns: N, agent, mode, w_hat_mean, wall_ms_mean, label
     plt.figure(figsize=(6.5, 4.5))
     markers = {"band": "o", "k_search": "^", "k_greedy": "s", "optimizer": "x"}
@@ -49,9 +93,10 @@ def plot_scaling(opt_scaling_csv: str, kg_scaling_csv: str, out_png: str) -> Non
     dfk = pd.read_csv(kg_scaling_csv)
     plt.figure(figsize=(6.5, 4.0))
     for df, name, mk in [(dfo, "optimizer", "x"), (dfk, "k_greedy", "s")]:
-        g = df.groupby("N", as_index=False).agg(wall_ms_mean=("wall_ms_mean", "mean"))
-        g = g.sort_values("N")
-        plt.plot(g["N"], g["wall_ms_mean"], marker=mk, label=name)
+        n_vals, wall_ms_mean = _mean_by_key(
+            df["N"].to_numpy(), df["wall_ms_mean"].to_numpy(dtype=float)
+        )
+        plt.plot(n_vals, wall_ms_mean, marker=mk, label=name)
     plt.xlabel("N agents")
     plt.ylabel("Per-agent wall time (ms)")
     plt.legend()
@@ -64,12 +109,24 @@ def plot_heatmap_band(band_frontier_csv: str, out_png: str) -> None:
     df = pd.read_csv(band_frontier_csv)
     # Use aggregated cells per (N,tau)
     sub = df[(df["agent"] == "satisficer") & (df["mode"] == "band")]
-    piv = sub.pivot_table(index="tau", columns="N", values="w_hat_mean", aggfunc="mean")
+    # Mean per observed (tau, N) cell on a dense grid; unobserved cells stay NaN
+    tau_v = sub["tau"].to_numpy(dtype=float)
+    n_v = sub["N"].to_numpy(dtype=float)
+    w_v = sub["w_hat_mean"].to_numpy(dtype=float)
+    ok = ~(np.isnan(tau_v) | np.isnan(n_v) | np.isnan(w_v))
+    taus, t_inv = np.unique(sub["tau"].to_numpy()[ok], return_inverse=True)
+    ns, n_inv = np.unique(sub["N"].to_numpy()[ok], return_inverse=True)
+    sums = np.zeros((taus.size, ns.size))
+    cnts = np.zeros_like(sums)
+    np.add.at(sums, (t_inv, n_inv), w_v[ok])
+    np.add.at(cnts, (t_inv, n_inv), 1)
+    with np.errstate(invalid="ignore"):
+        grid = sums / cnts
     plt.figure(figsize=(6.0, 4.0))
-    im = plt.imshow(piv.values, aspect="auto", origin="lower", cmap="viridis")
+    im = plt.imshow(grid, aspect="auto", origin="lower", cmap="viridis")
     plt.colorbar(im, label="Ŵ")
-    plt.xticks(range(len(piv.columns)), piv.columns)
-    plt.yticks(range(len(piv.index)), piv.index)
+    plt.xticks(range(ns.size), ns.tolist())
+    plt.yticks(range(taus.size), taus.tolist())
     plt.xlabel("N agents")
     plt.ylabel("τ (%)")
     plt.tight_layout()
@@ -83,12 +140,12 @@ def plot_robustness_call(kg_overlay_csv: str, out_png: str) -> None:
     df = df[(df["agent"] == "satisficer") & (df["mode"] == "k_greedy")]
     plt.figure(figsize=(6.5, 4.5))
     for label, g in df.groupby("label"):
-        g2 = g.groupby("N", as_index=False).agg(
-            w_hat_mean=("w_hat_mean", "mean"),
-            wall_ms_mean=("wall_ms_mean", "mean"),
+        _, w_hat_mean, wall_ms_mean = _mean_by_key(
+            g["N"].to_numpy(),
+            g["w_hat_mean"].to_numpy(dtype=float),
+            g["wall_ms_mean"].to_numpy(dtype=float),
         )
-        g2 = g2.sort_values("N")
-        plt.plot(g2["wall_ms_mean"], g2["w_hat_mean"], marker="o", linestyle="-", label=label)
+        plt.plot(wall_ms_mean, w_hat_mean, marker="o", linestyle="-", label=label)
     plt.xlabel("Per-agent wall time (ms)")
     plt.ylabel("Normalized welfare (Ŵ)")
     plt.legend(title="auction", fontsize=8)
@@ -97,13 +154,47 @@ def plot_robustness_call(kg_overlay_csv: str, out_png: str) -> None:
     plt.close()
 
 
+def plot_overlay_kg_ticker(overlay_csv: str, out_png: str) -> None:
+    # Book vs ticker information for k_greedy, averaged per N
+    df = pd.read_csv(overlay_csv)
+    # One grouping pass, sorted by (label, N); the loop only dispatches the plot calls
+    agg = df.groupby(["label", "N"], as_index=False).agg(
+        w_hat_mean=("w_hat_mean", "mean"),
+        wall_ms_mean=("wall_ms_mean", "mean"),
+    )
+    plt.figure(figsize=(6.5, 4.5))
+    for label, g in agg.groupby("label", sort=False):
+        plt.plot(g["wall_ms_mean"], g["w_hat_mean"], marker="o", linestyle="-", label=label)
+    plt.xlabel("Per-agent wall time (ms)")
+    plt.ylabel("Normalized welfare (Ŵ)")
+    plt.legend(title="info", fontsize=8)
+    plt.tight_layout()
+    plt.savefig(out_png, dpi=200)
+    plt.close()
+
+
 def _join_ratio_to_opt(runs_csv: str) -> pd.DataFrame:
+    return _join_ratio_to_opt_for(runs_csv, *_file_key(runs_csv))
+
+
+# Joined frames per (runs CSV path, mtime, size), keyed like aggregate's CSV caches: the
+# ratio, connector and small-multiple figures of one runs CSV share a single join, and a
+# rewritten CSV gets a new key. Callers must not mutate them.
+@functools.lru_cache(maxsize=8)
+def _join_ratio_to_opt_for(runs_csv: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    return _join_ratio_to_opt_df(_read_runs(runs_csv))
+
+
+def _read_runs(runs_csv: str) -> pd.DataFrame:
+    return pd.read_csv(runs_csv, usecols=_RUNS_COLS, engine=_CSV_ENGINE)
+
+
+def _join_ratio_to_opt_df(df: pd.DataFrame) -> pd.DataFrame:
     """Compute per-run ratio R_W = W_sat / W_opt by joining on (N, seed).
 
     Returns a DataFrame with satisficer rows augmented with R_W and optimizer W, filtered
     to rows where a matching optimizer run exists.
     """
-    df = pd.read_csv(runs_csv)
     sat = df[df["agent"] == "satisficer"].copy()
     opt = df[df["agent"] == "optimizer"][["N", "seed", "W", "w_hat", "wall_ms", "label"]].copy()
     opt = opt.rename(
@@ -119,51 +210,57 @@ def _join_ratio_to_opt(runs_csv: str) -> pd.DataFrame:
     return merged
 
 
-def plot_ratio_to_optimizer(runs_csv: str, out_png: str) -> None:
-    df = _join_ratio_to_opt(runs_csv)
+def plot_ratio_to_optimizer(runs_csv: str, out_png: str, *, annotate: bool = False) -> None:
+    plot_ratio_to_optimizer_from_df(_join_ratio_to_opt(runs_csv), out_png, annotate=annotate)
+
+
+def plot_ratio_to_optimizer_from_df(
+    df: pd.DataFrame, out_png: str, *, annotate: bool = False
+) -> None:
+    """`df` is the satisficer/optimizer join from `_join_ratio_to_opt`.
+
+    One errorbar series (and legend entry) per (mode, N); `annotate` labels each cell's
+    point with its tau/K.
+    """
     # Aggregate per cell (N, mode, tau, K) with bootstrap CI over seeds
     plt.figure(figsize=(6.8, 4.6))
     mode_markers = {"band": "o", "k_search": "^", "k_greedy": "s"}
-    cell = (
-        df.groupby(["N", "mode", "tau", "K"], as_index=False, dropna=False)
-        .agg(
-            wall_ms_mean=("wall_ms", "mean"),
-            R_W_mean=("R_W", "mean"),
-        )
-        .copy()
+    gb = df.groupby(["N", "mode", "tau", "K"], as_index=False, dropna=False)
+    cell = gb.agg(
+        wall_ms_mean=("wall_ms", "mean"),
+        R_W_mean=("R_W", "mean"),
     )
-    # Compute CIs separately to preserve grouping order
+    # CIs from the same grouping (same sorted order), one vectorized resample per cell
     ci_lo = []
     ci_hi = []
-    for _, g in df.groupby(["N", "mode", "tau", "K"], as_index=False, dropna=False):
-        lo, hi = bootstrap_ci(g["R_W"].tolist(), n_boot=2000)
+    for _, r_w in gb["R_W"]:
+        lo, hi = bootstrap_ci(r_w.to_numpy(), n_boot=2000)
         ci_lo.append(lo)
         ci_hi.append(hi)
     cell["R_W_lo"] = ci_lo
     cell["R_W_hi"] = ci_hi
     for (mode, n_val), g in cell.groupby(["mode", "N"], as_index=False):
         marker = mode_markers.get(mode or "", "o")
-        # Build concise label with parameter
-        if mode == "band":
-            param = [f"tau={int(x)}" if pd.notna(x) else "tau=na" for x in g["tau"]]
-        else:
-            param = [f"K={int(x)}" if pd.notna(x) else "K=na" for x in g["K"]]
-        labels = [f"{mode}:{p}:N={n_val}" for p in param]
-        # Plot each row to attach distinct labels cleanly
-        for i in range(len(g)):
-            yerr_low = g.iloc[i]["R_W_mean"] - g.iloc[i]["R_W_lo"]
-            yerr_high = g.iloc[i]["R_W_hi"] - g.iloc[i]["R_W_mean"]
-            plt.errorbar(
-                [g.iloc[i]["wall_ms_mean"]],
-                [g.iloc[i]["R_W_mean"]],
-                yerr=[[yerr_low], [yerr_high]],
-                fmt=marker,
-                capsize=3,
-                linestyle="none",
-                elinewidth=0.8,
-                label=labels[i],
-            )
-        # Avoid duplicate legend entries across N groups handled by Matplotlib dedupe
+        x = g["wall_ms_mean"].to_numpy()
+        y = g["R_W_mean"].to_numpy()
+        yerr = np.vstack([y - g["R_W_lo"].to_numpy(), g["R_W_hi"].to_numpy() - y])
+        plt.errorbar(
+            x,
+            y,
+            yerr=yerr,
+            fmt=marker,
+            capsize=3,
+            linestyle="none",
+            elinewidth=0.8,
+            label=f"{mode}:N={n_val}",
+        )
+        if annotate:
+            name = "tau" if mode == "band" else "K"
+            # Truncated like int(); missing values label as "na"
+            vals = np.trunc(g[name].to_numpy(dtype=float))
+            params = f"{name}=" + pd.array(vals).astype("Int64").astype("string").fillna("na")
+            for xi, yi, param in zip(x, y, params.tolist(), strict=True):
+                plt.annotate(param, (xi, yi), fontsize=6, xytext=(3, 3), textcoords="offset points")
     # Shade H1 target band 0.90–0.98
     plt.axhspan(0.90, 0.98, color="gray", alpha=0.10, zorder=0)
     plt.xlabel("Per-agent wall time (ms)")
@@ -175,67 +272,71 @@ def plot_ratio_to_optimizer(runs_csv: str, out_png: str) -> None:
 
 
 def plot_connector_overlay(overlay_csv: str, runs_csv: str, out_png: str) -> None:
+    plot_connector_overlay_from_df(
+        pd.read_csv(overlay_csv), _join_ratio_to_opt(runs_csv), out_png
+    )
+
+
+def plot_connector_overlay_from_df(
+    df_front: pd.DataFrame, df_runs: pd.DataFrame, out_png: str
+) -> None:
     """On Ŵ vs ms axes, connect optimizer to satisficer per-cell and annotate R_W.
 
-    Uses aggregated Ŵ and wall_ms from overlay_csv; computes R_W from per-run W means.
+    Uses aggregated Ŵ and wall_ms from the overlay frontier `df_front`; computes R_W from
+    per-run W means in the ratio join `df_runs`.
     """
-    df_front = pd.read_csv(overlay_csv)
-    df_runs = _join_ratio_to_opt(runs_csv)
-    # Aggregate W means per cell for annotation
-    w_agg = (
-        df_runs.groupby(["N", "agent", "mode", "tau", "K"], as_index=False, dropna=False)
-        .agg(W_mean=("W", "mean"))
-        .copy()
-    )
-    w_opt_agg = (
-        df_runs.groupby(["N"], as_index=False)
-        .agg(W_opt_mean=("W_opt", "mean"))
-        .copy()
+    # Aggregate W means per cell for annotation (lookup tables only: group order is unused)
+    w_agg = df_runs.groupby(
+        ["N", "agent", "mode", "tau", "K"], as_index=False, dropna=False, sort=False
+    ).agg(W_mean=("W", "mean"))
+    w_opt_agg = df_runs.groupby(["N"], as_index=False, sort=False).agg(
+        W_opt_mean=("W_opt", "mean")
     )
     plt.figure(figsize=(6.8, 4.8))
     # Plot optimizer aggregated points
-    opt_front = df_front[df_front["agent"] == "optimizer"].copy()
+    opt_front = df_front[df_front["agent"] == "optimizer"]
     plt.scatter(
         opt_front["wall_ms_mean"], opt_front["w_hat_mean"], marker="x", c="k", label="optimizer"
     )
-    # For each satisficer cell, plot point and connector to same-N optimizer
-    sat_front = df_front[df_front["agent"] == "satisficer"].copy()
-    for _, row in sat_front.iterrows():
-        n_val = row["N"]
-        mode = row["mode"]
-        tau = row.get("tau")
-        k_val = row.get("K")
-        # Point
-        plt.scatter(row["wall_ms_mean"], row["w_hat_mean"], s=30, alpha=0.9)
-        # Connector
-        opt_match = opt_front[opt_front["N"] == n_val]
-        if not opt_match.empty:
-            x0 = float(opt_match.iloc[0]["wall_ms_mean"])  # optimizer
-            y0 = float(opt_match.iloc[0]["w_hat_mean"])
-            x1 = float(row["wall_ms_mean"])  # satisficer
-            y1 = float(row["w_hat_mean"])
-            plt.plot([x0, x1], [y0, y1], color="gray", linewidth=0.8, alpha=0.6)
-            # Annotate ratio R_W using aggregated W means
-            cond = (
-                (w_agg["N"] == n_val)
-                & (w_agg["mode"] == mode)
-                & (w_agg["tau"] == tau)
-                & (w_agg["K"] == k_val)
-            )
-            w_sat = w_agg[cond]
-            w_opt = w_opt_agg[w_opt_agg["N"] == n_val]
-            if not w_sat.empty and not w_opt.empty:
-                w_opt_mean = float(w_opt.iloc[0]["W_opt_mean"])
-                rw = float("nan")
-                if w_opt_mean > 0:
-                    rw = float(w_sat.iloc[0]["W_mean"]) / w_opt_mean
-                plt.text(
-                    (x0 + x1) / 2,
-                    (y0 + y1) / 2,
-                    f"{rw:.2f}×",
-                    fontsize=7,
-                    color="gray",
-                )
+    # Satisficer cells joined to their same-N optimizer point (first per N) and to the W
+    # means for R_W. Merge keys match missing tau/K (NaN) to each other, so band and k cells
+    # find their own aggregates.
+    opt_xy = opt_front.drop_duplicates("N")[["N", "wall_ms_mean", "w_hat_mean"]].rename(
+        columns={"wall_ms_mean": "x0", "w_hat_mean": "y0"}
+    )
+    sf = (
+        df_front[df_front["agent"] == "satisficer"]
+        .merge(opt_xy, on="N", how="left")
+        .merge(w_agg, on=["N", "agent", "mode", "tau", "K"], how="left")
+        .merge(w_opt_agg, on="N", how="left")
+    )
+    # One point per cell, coloured in cycle order
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    plt.scatter(
+        sf["wall_ms_mean"],
+        sf["w_hat_mean"],
+        s=30,
+        alpha=0.9,
+        c=[colors[i % len(colors)] for i in range(len(sf))],
+    )
+    # Connectors from each optimizer point to its satisficer cells, as one collection
+    linked = sf[sf["x0"].notna()]
+    x0 = linked["x0"].to_numpy(dtype=float)
+    y0 = linked["y0"].to_numpy(dtype=float)
+    x1 = linked["wall_ms_mean"].to_numpy(dtype=float)
+    y1 = linked["w_hat_mean"].to_numpy(dtype=float)
+    segments = [((a, b), (c, d)) for a, b, c, d in zip(x0, y0, x1, y1, strict=True)]
+    plt.gca().add_collection(
+        LineCollection(segments, colors="gray", linewidths=0.8, alpha=0.6, zorder=2)
+    )
+    # Annotate ratio R_W using aggregated W means
+    w_sat = linked["W_mean"].to_numpy(dtype=float)
+    w_opt = linked["W_opt_mean"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rw = np.where(w_opt > 0, w_sat / w_opt, np.nan)
+    has_w = linked["W_mean"].notna().to_numpy() & linked["W_opt_mean"].notna().to_numpy()
+    for xm, ym, r in zip(((x0 + x1) / 2)[has_w], ((y0 + y1) / 2)[has_w], rw[has_w], strict=True):
+        plt.text(xm, ym, f"{r:.2f}×", fontsize=7, color="gray")
     plt.xlabel("Per-agent wall time (ms)")
     plt.ylabel("Normalized welfare (Ŵ)")
     plt.title("Optimizer→Satisficer connectors with R_W annotations")
@@ -245,9 +346,13 @@ def plot_connector_overlay(overlay_csv: str, runs_csv: str, out_png: str) -> Non
 
 
 def plot_small_multiples(overlay_csv: str, runs_csv: str, out_png: str) -> None:
+    plot_small_multiples_from_df(pd.read_csv(overlay_csv), _join_ratio_to_opt(runs_csv), out_png)
+
+
+def plot_small_multiples_from_df(
+    df_front: pd.DataFrame, df_ratio: pd.DataFrame, out_png: str
+) -> None:
     """Two panels: left Ŵ vs ms; right R_W vs ms (with 0.90–0.98 band)."""
-    df_front = pd.read_csv(overlay_csv)
-    df_ratio = _join_ratio_to_opt(runs_csv)
     fig, axs = plt.subplots(1, 2, figsize=(11.0, 4.5))
     # Left: Ŵ vs ms
     markers = {"band": "o", "k_search": "^", "k_greedy": "s", "optimizer": "x"}
@@ -265,20 +370,57 @@ def plot_small_multiples(overlay_csv: str, runs_csv: str, out_png: str) -> None:
     # Right: R_W vs ms
     ax2 = axs[1]
     mode_markers = {"band": "o", "k_search": "^", "k_greedy": "s"}
-    for (mode, n_val), g in df_ratio.groupby(["mode", "N"], as_index=False):
-        marker = mode_markers.get(mode or "", "o")
+    # One scatter per mode (the marker); colours follow the cycle per (mode, N) group, as
+    # one scatter per group would. The legend keeps an entry per group via proxy artists.
+    gb = df_ratio.groupby(["mode", "N"])
+    code = gb.ngroup().to_numpy()
+    keys = gb.size().index
+    cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    handles = [
+        Line2D(
+            [],
+            [],
+            linestyle="none",
+            marker=mode_markers.get(mode or "", "o"),
+            color=cycle[i % len(cycle)],
+            alpha=0.7,
+            label=f"{mode or 'na'}:N={n_val}",
+        )
+        for i, (mode, n_val) in enumerate(keys)
+    ]
+    wall_ms = df_ratio["wall_ms"].to_numpy(dtype=float)
+    r_w = df_ratio["R_W"].to_numpy(dtype=float)
+    for mode in keys.get_level_values("mode").unique():
+        sel = (df_ratio["mode"] == mode).to_numpy() & (code >= 0)
         ax2.scatter(
-            g["wall_ms"], g["R_W"], marker=marker, alpha=0.7, label=f"{mode or 'na'}:N={n_val}"
+            wall_ms[sel],
+            r_w[sel],
+            marker=mode_markers.get(mode or "", "o"),
+            alpha=0.7,
+            c=[cycle[i % len(cycle)] for i in code[sel]],
         )
     ax2.axhspan(0.90, 0.98, color="gray", alpha=0.10, zorder=0)
     ax2.set_xlabel("Per-agent wall time (ms)")
     ax2.set_ylabel("R_W = W_sat / W_opt")
-    ax2.legend(ncol=1, fontsize=8)
+    ax2.legend(handles=handles, ncol=1, fontsize=8)
     fig.tight_layout()
     fig.savefig(out_png, dpi=200)
     plt.close(fig)
 
 
+# Names accepted by --figures, in generation order
+_FIGURES = (
+    "frontier",
+    "scaling",
+    "heatmap",
+    "robustness",
+    "ticker",
+    "ratio",
+    "connector",
+    "multiples",
+)
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     p = argparse.ArgumentParser(
@@ -314,53 +456,124 @@ def main() -> None:
         default="outputs/analysis/overlay_v4/combined_runs.csv",
         help="Combined per-run metrics (for ratio plots)",
     )
-    args = p.parse_args()
-
-    _ensure_dir(args.out_dir)
-    plot_frontier_overlay_cda(
-        args.overlay_cda, os.path.join(args.out_dir, "frontier_overlay_cda.png")
-    )
-    plot_scaling(
-        args.opt_scaling, args.kg_scaling, os.path.join(args.out_dir, "scaling_opt_vs_kgreedy.png")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to render the figures (1 = in-process)",
     )
-    plot_heatmap_band(
-        args.band_frontier, os.path.join(args.out_dir, "heatmap_band.png")
+    p.add_argument(
+        "--figures",
+        default="all",
+        help=f"Comma-separated subset of figures to generate ({', '.join(_FIGURES)}) or 'all'",
     )
-    plot_robustness_call(
-        args.overlay_kg_call, os.path.join(args.out_dir, "robustness_call.png")
+    p.add_argument(
+        "--format",
+        choices=["png", "pdf"],
+        default="png",
+        help="Output format: 200 dpi PNG, or vector PDF (no rasterization)",
     )
-    # Ticker overlay (book vs ticker for k_greedy)
-    try:
-        df = pd.read_csv(args.overlay_kg_ticker)
-        plt.figure(figsize=(6.5, 4.5))
-        for label, g in df.groupby("label"):
-            g2 = g.groupby("N", as_index=False).agg(
-                w_hat_mean=("w_hat_mean", "mean"),
-                wall_ms_mean=("wall_ms_mean", "mean"),
-            )
-            g2 = g2.sort_values("N")
-            plt.plot(g2["wall_ms_mean"], g2["w_hat_mean"], marker="o", linestyle="-", label=label)
-        plt.xlabel("Per-agent wall time (ms)")
-        plt.ylabel("Normalized welfare (Ŵ)")
-        plt.legend(title="info", fontsize=8)
-        plt.tight_layout()
-        plt.savefig(os.path.join(args.out_dir, "overlay_kg_ticker.png"), dpi=200)
-        plt.close()
-    except Exception as exc:  # noqa: BLE001
-        logging.warning("Could not generate overlay_kg_ticker: %s", exc)
+    args = p.parse_args()
+    # Files only: the non-interactive backend avoids probing for a GUI toolkit
+    matplotlib.use("Agg")
 
-    # Ratio-to-optimizer and connector/small-multiple plots
-    try:
-        plot_ratio_to_optimizer(
-            args.overlay_runs, os.path.join(args.out_dir, "ratio_to_optimizer.png")
+    want = {f.strip() for f in args.figures.split(",") if f.strip()}
+    unknown = want - set(_FIGURES) - {"all"}
+    if unknown:
+        raise SystemExit(
+            f"--figures: unknown {', '.join(sorted(unknown))} (choose from {', '.join(_FIGURES)})"
         )
-        plot_connector_overlay(
-            args.overlay_cda, args.overlay_runs, os.path.join(args.out_dir, "connector_overlay.png")
+    if "all" in want:
+        want = set(_FIGURES)
+
+    _ensure_dir(args.out_dir)
+
+    def out(name: str) -> str:
+        return os.path.join(args.out_dir, f"{name}.{args.format}")
+
+    # Each input CSV is parsed once, and only when a selected figure reads it; figures
+    # sharing an input get the same frame
+    jobs: list[tuple[Callable[..., None], tuple[Any, ...]]] = []
+    if want & {"frontier", "connector", "multiples"}:
+        df_overlay_cda = pd.read_csv(args.overlay_cda)
+    if "frontier" in want:
+        jobs.append(
+            (plot_frontier_overlay_cda_from_df, (df_overlay_cda, out("frontier_overlay_cda")))
         )
-        out_path = os.path.join(args.out_dir, "frontier_and_ratio.png")
-        plot_small_multiples(args.overlay_cda, args.overlay_runs, out_path)
-    except Exception as exc:  # noqa: BLE001
-        logging.warning("Could not generate ratio/connector/small-multiple plots: %s", exc)
+    if "scaling" in want:
+        jobs.append(
+            (plot_scaling, (args.opt_scaling, args.kg_scaling, out("scaling_opt_vs_kgreedy")))
+        )
+    if "heatmap" in want:
+        jobs.append((plot_heatmap_band, (args.band_frontier, out("heatmap_band"))))
+    if "robustness" in want:
+        jobs.append((plot_robustness_call, (args.overlay_kg_call, out("robustness_call"))))
+    if "ticker" in want:
+        jobs.append(
+            (
+                _best_effort,
+                (
+                    "overlay_kg_ticker",
+                    plot_overlay_kg_ticker,
+                    args.overlay_kg_ticker,
+                    out("overlay_kg_ticker"),
+                ),
+            )
+        )
+    # Ratio-to-optimizer and connector/small-multiple plots share one joined frame
+    if want & {"ratio", "connector", "multiples"}:
+        try:
+            df_ratio = _join_ratio_to_opt_df(_read_runs(args.overlay_runs))
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Could not generate ratio/connector/small-multiple plots: %s", exc)
+        else:
+            if "ratio" in want:
+                jobs.append(
+                    (
+                        _best_effort,
+                        (
+                            "ratio_to_optimizer",
+                            plot_ratio_to_optimizer_from_df,
+                            df_ratio,
+                            out("ratio_to_optimizer"),
+                        ),
+                    )
+                )
+            if "connector" in want:
+                jobs.append(
+                    (
+                        _best_effort,
+                        (
+                            "connector_overlay",
+                            plot_connector_overlay_from_df,
+                            df_overlay_cda,
+                            df_ratio,
+                            out("connector_overlay"),
+                        ),
+                    )
+                )
+            if "multiples" in want:
+                jobs.append(
+                    (
+                        _best_effort,
+                        (
+                            "frontier_and_ratio",
+                            plot_small_multiples_from_df,
+                            df_overlay_cda,
+                            df_ratio,
+                            out("frontier_and_ratio"),
+                        ),
+                    )
+                )
+    # Figures share no state; each worker process has its own pyplot
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            futures = [ex.submit(fn, *fn_args) for fn, fn_args in jobs]
+            for fut in futures:
+                fut.result()
+    else:
+        for fn, fn_args in jobs:
+            fn(*fn_args)
     logging.info("Wrote figures to %s", args.out_dir)
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import time
 from collections.abc import Callable
@@ -16,8 +17,17 @@ def time_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[Any, f
     return result, elapsed_ms
 
 
+# Sample process memory every this many intervals; RSS barely moves between 5-min steps
+MEM_SAMPLE_INTERVALS = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _process(pid: int) -> psutil.Process:
+    return psutil.Process(pid)
+
+
 def process_mem_mb() -> float:
     """Return current process RSS in MiB."""
-    proc = psutil.Process(os.getpid())
-    rss = proc.memory_info().rss
+    # Keyed by pid so a forked worker does not report its parent's handle
+    rss = _process(os.getpid()).memory_info().rss
     return rss / (1024 * 1024)
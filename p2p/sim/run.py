@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import os
 from contextlib import suppress
 from dataclasses import asdict
-from typing import Any
+from typing import Any, TextIO
 
 from ..agents.optimizer import Optimizer
+from ..agents.prosumer import Decision
 from ..agents.satisficer import Satisficer
 from ..agents.zi import ZIConstrained
 from ..market.clearing import step_interval
 from ..market.order_book import OrderBook
-from .metrics import RunSummary, compute_quote_welfare, planner_bound_quote_welfare
-from .profiling import process_mem_mb
+from .csvlog import DECISION_FMT, DECISION_HEADER, INTERVAL_FMT, INTERVAL_HEADER
+from .metrics import (
+    RunSummary,
+    compute_quote_welfare,
+    planner_bound_from_columns,
+    trade_price_stats,
+)
+from .profiling import MEM_SAMPLE_INTERVALS, process_mem_mb
+
+# Rows per write() call and buffer size of the optional CSV logs
+_CSV_CHUNK_ROWS = 256
+_CSV_BUFFER_BYTES = 1 << 20
 
 
 def run_smoke(
@@ -40,112 +50,91 @@ def run_smoke(
     total_posted = 0.0
     total_traded = 0.0
     run_id = "smoke"
-    writer = None
-    interval_writer = None
+    fh: TextIO | None = None
+    fh_int: TextIO | None = None
+    # Formatted rows go out through one write() per _CSV_CHUNK_ROWS
+    decision_rows: list[str] = []
+    interval_rows: list[str] = []
     if instrument and metrics_out:
         os.makedirs(os.path.dirname(metrics_out) or ".", exist_ok=True)
-        fh = open(metrics_out, mode="w", newline="")  # noqa: SIM115
-        writer = csv.writer(fh)
-        writer.writerow(
-            [
-                "run_id",
-                "t",
-                "agent_id",
-                "agent_type",
-                "action_type",
-                "price_cperkwh",
-                "qty_kwh",
-                "offers_seen",
-                "solver_calls",
-                "learners_steps",
-                "wall_ms",
-                "mem_mb",
-            ]
-        )
-    # Optional per-interval metrics CSV
+        fh = open(metrics_out, mode="w", newline="", buffering=_CSV_BUFFER_BYTES)  # noqa: SIM115
+        fh.write(DECISION_HEADER)
+    # Optional per-interval metrics CSV, and (P2P_DEBUG_W_HAT=1) a dump of intervals whose
+    # W_hat exceeds 1
     interval_metrics_path = os.environ.get("P2P_INTERVAL_METRICS")
+    debug_w_hat = os.environ.get("P2P_DEBUG_W_HAT") == "1"
     if interval_metrics_path:
         os.makedirs(os.path.dirname(interval_metrics_path) or ".", exist_ok=True)
-        fh_int = open(interval_metrics_path, mode="w", newline="")  # noqa: SIM115
-        interval_writer = csv.writer(fh_int)
-        interval_writer.writerow(
-            [
-                "t",
-                "trades",
-                "traded_kwh",
-                "posted_buy_kwh",
-                "posted_sell_kwh",
-                "unserved_kwh",
-                "curtailment_kwh",
-                "price_mean",
-                "price_var",
-                "W",
-                "W_bound",
-                "W_hat",
-            ]
+        fh_int = open(  # noqa: SIM115
+            interval_metrics_path, mode="w", newline="", buffering=_CSV_BUFFER_BYTES
         )
+        fh_int.write(INTERVAL_HEADER)
     try:
+        mem_mb = 0.0
         for t in range(intervals):
-            # Sample process memory once per interval for logging
-            mem_mb = process_mem_mb() if instrument else 0.0
+            # Sample process memory periodically for logging (reused between samples)
+            if instrument and t % MEM_SAMPLE_INTERVALS == 0:
+                mem_mb = process_mem_mb()
             # Optional decision logger to avoid double decision calls
             decision_logger = None
-            if instrument and writer is not None:
+            if instrument and fh is not None:
                 # Bind loop variables (t, mem_mb) to avoid late-binding warnings (B023)
                 def _log(
                     a: Any,
-                    act: dict[str, Any] | Any,
+                    act: Decision | dict[str, Any] | Any,
                     wall_ms: float,
                     *,
                     t_bound: int = t,
                     mem_mb_bound: float = mem_mb,
+                    out: TextIO = fh,
                 ) -> None:
-                    if isinstance(act, dict):
-                        action_type = str(act.get("type", "none"))
-                        offers_seen = int(act.get("offers_seen", 0))
-                        solver_calls = int(act.get("solver_calls", 0))
-                        learners_steps = int(act.get("learners_steps", 0))
-                        price = act.get("price")
-                        qty = act.get("qty_kwh")
+                    d = Decision.of(act)
+                    if d is not None:
+                        action_type = d.type
+                        offers_seen = int(d.offers_seen)
+                        solver_calls = int(d.solver_calls)
+                        learners_steps = int(d.learners_steps)
+                        price = d.price
+                        qty = d.qty_kwh
                     else:
                         action_type = "none"
                         offers_seen = solver_calls = learners_steps = 0
                         price = qty = None
                     agent_type = a.__class__.__name__
-                    writer.writerow(
-                        [
+                    decision_rows.append(
+                        DECISION_FMT.format(
                             run_id,
                             t_bound,
                             a.agent_id,
                             agent_type,
                             action_type,
-                            price,
-                            qty,
+                            "" if price is None else price,
+                            "" if qty is None else qty,
                             offers_seen,
                             solver_calls,
                             learners_steps,
-                            f"{wall_ms:.3f}",
-                            f"{mem_mb_bound:.2f}",
-                        ]
+                            wall_ms,
+                            mem_mb_bound,
+                        )
                     )
+                    if len(decision_rows) >= _CSV_CHUNK_ROWS:
+                        out.write("".join(decision_rows))
+                        decision_rows.clear()
+
                 decision_logger = _log
             result = step_interval(t=t, agents=agents, ob=ob, decision_logger=decision_logger)
             total_posted += result.posted_kwh
             total_traded += result.traded_kwh
-            if interval_writer is not None:
-                prices = [tr.price_cperkwh for tr in result.trades_detail]
-                price_mean = sum(prices) / len(prices) if prices else 0.0
-                price_var = (
-                    sum((p - price_mean) ** 2 for p in prices) / len(prices) if prices else 0.0
-                )
+            if fh_int is not None:
+                price_mean, price_var = trade_price_stats(result.trades_detail)
                 w = compute_quote_welfare(result.trades_detail)
                 # Planner bound using the union of starting resting book and new posts
-                bids_union = result.book_bids_start + result.posted_bids
-                asks_union = result.book_asks_start + result.posted_asks
-                w_bound, _ = planner_bound_quote_welfare(bids=bids_union, asks=asks_union)
+                w_bound, _ = planner_bound_from_columns(
+                    bids=result.bid_columns, asks=result.ask_columns
+                )
                 w_hat = (w / w_bound) if w_bound > 0 else 0.0
                 # Debug: print if W_hat > 1 (should not happen)
-                if w_bound > 0 and w_hat > 1.000001:
+                if debug_w_hat and w_bound > 0 and w_hat > 1.000001:
                     vol_bids0 = sum(o.qty_kwh for o in result.book_bids_start)
                     vol_asks0 = sum(o.qty_kwh for o in result.book_asks_start)
                     vol_bids_post = sum(o.qty_kwh for o in result.posted_bids)
@@ -159,27 +148,35 @@ def run_smoke(
                     )
                 unserved = max(0.0, result.posted_buy_kwh - result.traded_kwh)
                 curtail = max(0.0, result.posted_sell_kwh - result.traded_kwh)
-                interval_writer.writerow(
-                    [
+                interval_rows.append(
+                    INTERVAL_FMT
+                    % (
                         t,
                         result.trades,
-                        f"{result.traded_kwh:.6f}",
-                        f"{result.posted_buy_kwh:.6f}",
-                        f"{result.posted_sell_kwh:.6f}",
-                        f"{unserved:.6f}",
-                        f"{curtail:.6f}",
-                        f"{price_mean:.6f}",
-                        f"{price_var:.6f}",
-                        f"{w:.6f}",
-                        f"{w_bound:.6f}",
-                        f"{w_hat:.6f}",
-                    ]
+                        result.traded_kwh,
+                        result.posted_buy_kwh,
+                        result.posted_sell_kwh,
+                        unserved,
+                        curtail,
+                        price_mean,
+                        price_var,
+                        w,
+                        w_bound,
+                        w_hat,
+                    )
                 )
+                if len(interval_rows) >= _CSV_CHUNK_ROWS:
+                    fh_int.write("".join(interval_rows))
+                    interval_rows.clear()
     finally:
-        if writer is not None:
+        if fh is not None:
+            with suppress(Exception):
+                fh.write("".join(decision_rows))
             with suppress(Exception):
                 fh.close()
-        if interval_writer is not None:
+        if fh_int is not None:
+            with suppress(Exception):
+                fh_int.write("".join(interval_rows))
             with suppress(Exception):
                 fh_int.close()
 
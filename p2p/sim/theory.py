@@ -1,58 +1,118 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+
+    HAVE_ORJSON = True
+except ImportError:  # pragma: no cover - orjson is optional
+    HAVE_ORJSON = False
+
+try:
+    import pyarrow  # noqa: F401
+
+    _CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - pyarrow is optional
+    _CSV_ENGINE = "c"
+
 
 def _read_json(path: str) -> dict[str, Any]:
-    with open(path) as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    if HAVE_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Manifests are written with json.dump's allow_nan=True (e.g. an infinite
+            # feeder_cap_kw); only the stdlib parser accepts Infinity/NaN
+            pass
+    return json.loads(raw)
+
+
+_INTERVAL_COLS = ["W_hat"]
+_DECISION_COLS = ["agent_id", "action_type", "offers_seen", "wall_ms"]
+
+
+def _read_csv(path: str, usecols: list[str]) -> pd.DataFrame:
+    return pd.read_csv(path, usecols=usecols, engine=_CSV_ENGINE)
+
+
+def _file_key(path: str) -> tuple[int, int]:
+    """(st_mtime_ns, st_size) of `path`, or (-1, -1) when it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return -1, -1
+    return st.st_mtime_ns, st.st_size
 
 
 def _mean_w_hat(interval_csv: str) -> float:
-    df = pd.read_csv(interval_csv)
+    """Mean W_hat across a run's intervals."""
+    df = _read_csv(interval_csv, _INTERVAL_COLS)
     return float(df["W_hat"].mean()) if not df.empty else float("nan")
 
 
-def _decision_stats(dec_csv: str) -> dict[str, float]:
-    """Compute acceptance rate and per-agent means from a decision CSV."""
+def _decision_stats(dec_csv: str) -> tuple[float, float, float]:
+    """Return (accept_rate, offers_seen_mean, wall_ms_mean) from a decision CSV.
+
+    The means are per agent, then averaged across agents.
+    """
     if not dec_csv or not os.path.exists(dec_csv):
-        return {
-            "accept_rate": float("nan"),
-            "offers_seen_mean": float("nan"),
-            "wall_ms_mean": float("nan"),
-        }
-    df = pd.read_csv(dec_csv)
+        return float("nan"), float("nan"), float("nan")
+    df = _read_csv(dec_csv, _DECISION_COLS)
     if df.empty:
-        return {
-            "accept_rate": float("nan"),
-            "offers_seen_mean": float("nan"),
-            "wall_ms_mean": float("nan"),
-        }
-    accept_rate = float((df["action_type"] == "accept").mean())
-    # Per-agent means, then overall mean across agents
-    g = df.groupby(["agent_id"], as_index=False).agg(
-        offers_seen_mean=("offers_seen", "mean"),
-        wall_ms_mean=("wall_ms", "mean"),
+        return float("nan"), float("nan"), float("nan")
+    accept_rate = float((df["action_type"].to_numpy() == "accept").mean())
+    # Per-agent means (one grouped pass over both columns), then the mean across agents
+    per_agent = df.groupby("agent_id")[["offers_seen", "wall_ms"]].mean()
+    offers_seen_mean, wall_ms_mean = per_agent.mean()
+    return accept_rate, float(offers_seen_mean), float(wall_ms_mean)
+
+
+# Per-file results keyed on (path, mtime, size): runs shared by several manifests are parsed
+# once, and a CSV rewritten in place gets a new key
+@functools.lru_cache(maxsize=4096)
+def _mean_w_hat_cached(interval_csv: str, mtime_ns: int, size: int) -> float:
+    return _mean_w_hat(interval_csv)
+
+
+@functools.lru_cache(maxsize=4096)
+def _decision_stats_cached(dec_csv: str, mtime_ns: int, size: int) -> tuple[float, float, float]:
+    return _decision_stats(dec_csv)
+
+
+def _run_files(run: dict[str, Any]) -> tuple[str, str]:
+    """(decision CSV, interval CSV) of a manifest run entry; "" when absent."""
+    return run.get("decision_csv") or "", run.get("interval_csv") or ""
+
+
+def _run_stats(files: tuple[str, str]) -> tuple[float, float, float, float]:
+    """(accept_rate, offers_seen_mean, wall_ms_mean, w_hat) for one run's CSVs."""
+    dec_csv, interval_csv = files
+    w_hat = (
+        _mean_w_hat_cached(interval_csv, *_file_key(interval_csv))
+        if interval_csv
+        else float("nan")
     )
-    return {
-        "accept_rate": accept_rate,
-        "offers_seen_mean": float(g["offers_seen_mean"].mean()),
-        "wall_ms_mean": float(g["wall_ms_mean"].mean()),
-    }
+    return (*_decision_stats_cached(dec_csv, *_file_key(dec_csv)), w_hat)
 
 
-def aggregate_theory(manifest_path: str) -> pd.DataFrame:
-    man = _read_json(manifest_path)
+def _theory_frame(
+    runs: list[dict[str, Any]], stats: list[tuple[float, float, float, float]]
+) -> pd.DataFrame:
     rows: list[dict[str, Any]] = []
-    for r in man.get("runs", []):
-        st = _decision_stats(r.get("decision_csv") or "")
-        w_hat = _mean_w_hat(r["interval_csv"]) if r.get("interval_csv") else float("nan")
+    for r, (accept_rate, offers_seen_mean, wall_ms_mean, w_hat) in zip(
+        runs, stats, strict=True
+    ):
         rows.append(
             {
                 "N": r.get("N"),
@@ -61,19 +121,25 @@ def aggregate_theory(manifest_path: str) -> pd.DataFrame:
                 "tau": r.get("tau"),
                 "K": r.get("K"),
                 "seed": r.get("seed"),
-                "accept_rate": st["accept_rate"],
-                "offers_seen_mean": st["offers_seen_mean"],
-                "wall_ms_mean": st["wall_ms_mean"],
+                "accept_rate": accept_rate,
+                "offers_seen_mean": offers_seen_mean,
+                "wall_ms_mean": wall_ms_mean,
                 "w_hat": w_hat,
             }
         )
     return pd.DataFrame(rows)
 
 
+def aggregate_theory(manifest_path: str) -> pd.DataFrame:
+    runs = _read_json(manifest_path).get("runs", [])
+    return _theory_frame(runs, [_run_stats(_run_files(r)) for r in runs])
+
+
 def per_cell(df: pd.DataFrame) -> pd.DataFrame:
     keys = ["N", "agent", "mode", "tau", "K"]
+    # Group unsorted: the explicit sort_values below orders the (unique) cells once
     return (
-        df.groupby(keys, as_index=False, dropna=False)
+        df.groupby(keys, as_index=False, dropna=False, sort=False)
         .agg(
             accept_rate=("accept_rate", "mean"),
             offers_seen_mean=("offers_seen_mean", "mean"),
@@ -85,93 +151,41 @@ def per_cell(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
-def diminishing_returns(df_cells: pd.DataFrame) -> pd.DataFrame:
-    parts = []
-    # Band over tau
-    for (n,), g in df_cells[df_cells["mode"] == "band"].groupby(["N"], dropna=False):
-        g2 = g.sort_values(["tau"]).reset_index(drop=True)
-        for i, row in g2.iterrows():
-            prev = g2.iloc[i - 1] if i > 0 else None
-            parts.append(
-                {
-                    "mode": "band",
-                    "N": n,
-                    "param": "tau",
-                    "value": row["tau"],
-                    "w_hat_mean": row["w_hat_mean"],
-                    "wall_ms_mean": row["wall_ms_mean"],
-                    "accept_rate": row["accept_rate"],
-                    "d_w_hat": (
-                        row["w_hat_mean"]
-                        - (prev["w_hat_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_wall_ms": (
-                        row["wall_ms_mean"]
-                        - (prev["wall_ms_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_accept": (
-                        row["accept_rate"]
-                        - (prev["accept_rate"] if prev is not None else np.nan)
-                    ),
-                }
-            )
-    # K-search over K
-    for (n,), g in df_cells[df_cells["mode"] == "k_search"].groupby(["N"], dropna=False):
-        g2 = g.sort_values(["K"]).reset_index(drop=True)
-        for i, row in g2.iterrows():
-            prev = g2.iloc[i - 1] if i > 0 else None
+def _param_steps(df_cells: pd.DataFrame, mode: str, param: str) -> list[dict[str, Any]]:
+    """Rows for `mode` cells per N in increasing `param`, with the change from the previous
+    value (NaN for the first)."""
+    cols = [param, "w_hat_mean", "wall_ms_mean", "accept_rate"]
+    parts: list[dict[str, Any]] = []
+    for (n,), g in df_cells[df_cells["mode"] == mode].groupby(["N"], dropna=False):
+        vals = g.sort_values([param])[cols].to_numpy(dtype=float)
+        deltas = np.diff(vals, axis=0, prepend=np.nan)
+        for (value, w_hat, wall_ms, accept), (_, d_w_hat, d_wall_ms, d_accept) in zip(
+            vals.tolist(), deltas.tolist(), strict=True
+        ):
             parts.append(
                 {
-                    "mode": "k_search",
+                    "mode": mode,
                     "N": n,
-                    "param": "K",
-                    "value": row["K"],
-                    "w_hat_mean": row["w_hat_mean"],
-                    "wall_ms_mean": row["wall_ms_mean"],
-                    "accept_rate": row["accept_rate"],
-                    "d_w_hat": (
-                        row["w_hat_mean"]
-                        - (prev["w_hat_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_wall_ms": (
-                        row["wall_ms_mean"]
-                        - (prev["wall_ms_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_accept": (
-                        row["accept_rate"]
-                        - (prev["accept_rate"] if prev is not None else np.nan)
-                    ),
+                    "param": param,
+                    "value": value,
+                    "w_hat_mean": w_hat,
+                    "wall_ms_mean": wall_ms,
+                    "accept_rate": accept,
+                    "d_w_hat": d_w_hat,
+                    "d_wall_ms": d_wall_ms,
+                    "d_accept": d_accept,
                 }
             )
-    # K-greedy over K
-    for (n,), g in df_cells[df_cells["mode"] == "k_greedy"].groupby(["N"], dropna=False):
-        g2 = g.sort_values(["K"]).reset_index(drop=True)
-        for i, row in g2.iterrows():
-            prev = g2.iloc[i - 1] if i > 0 else None
-            parts.append(
-                {
-                    "mode": "k_greedy",
-                    "N": n,
-                    "param": "K",
-                    "value": row["K"],
-                    "w_hat_mean": row["w_hat_mean"],
-                    "wall_ms_mean": row["wall_ms_mean"],
-                    "accept_rate": row["accept_rate"],
-                    "d_w_hat": (
-                        row["w_hat_mean"]
-                        - (prev["w_hat_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_wall_ms": (
-                        row["wall_ms_mean"]
-                        - (prev["wall_ms_mean"] if prev is not None else np.nan)
-                    ),
-                    "d_accept": (
-                        row["accept_rate"]
-                        - (prev["accept_rate"] if prev is not None else np.nan)
-                    ),
-                }
-            )
-    return pd.DataFrame(parts)
+    return parts
+
+
+def diminishing_returns(df_cells: pd.DataFrame) -> pd.DataFrame:
+    # Band over tau, K-search and K-greedy over K
+    return pd.DataFrame(
+        _param_steps(df_cells, "band", "tau")
+        + _param_steps(df_cells, "k_search", "K")
+        + _param_steps(df_cells, "k_greedy", "K")
+    )
 
 
 def offers_vs_time_regression(df_cells: pd.DataFrame) -> pd.DataFrame:
@@ -183,12 +197,20 @@ def offers_vs_time_regression(df_cells: pd.DataFrame) -> pd.DataFrame:
         x = x[mask]
         y = y[mask]
         if x.size >= 2:
-            coeffs = np.polyfit(x, y, 1)
-            y_pred = np.polyval(coeffs, x)
-            ss_res = float(np.sum((y - y_pred) ** 2))
-            ss_tot = float(np.sum((y - float(np.mean(y))) ** 2))
-            r2 = 1.0 - (ss_res / ss_tot) if ss_tot > 0 else float("nan")
-            slope = float(coeffs[0])
+            # Closed-form least-squares line (no Vandermonde/SVD as in np.polyfit)
+            x_mean = float(x.mean())
+            y_mean = float(y.mean())
+            dx = x - x_mean
+            dy = y - y_mean
+            sxx = float(dx @ dx)
+            ss_tot = float(dy @ dy)
+            if sxx > 0:
+                slope = float(dx @ dy) / sxx
+                resid = dy - slope * dx
+                ss_res = float(resid @ resid)
+                r2 = 1.0 - (ss_res / ss_tot) if ss_tot > 0 else float("nan")
+            else:
+                slope, r2 = float("nan"), float("nan")
         else:
             slope, r2 = float("nan"), float("nan")
         rows.append(
@@ -211,13 +233,33 @@ def main() -> None:
     )
     p.add_argument("--manifests", required=True, help="Comma-separated manifest.json paths")
     p.add_argument("--out-dir", default="outputs/analysis/phase9", help="Output directory")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to parse the runs' CSVs (1 = in-process)",
+    )
     args = p.parse_args()
 
     man_paths = [s for s in (m.strip() for m in args.manifests.split(",")) if s]
     os.makedirs(args.out_dir, exist_ok=True)
 
     # Load and concatenate per-run theory stats
-    frames = [aggregate_theory(m) for m in man_paths]
+    _mean_w_hat_cached.cache_clear()
+    _decision_stats_cached.cache_clear()
+    if args.workers > 1:
+        # Worker processes don't share the caches: dedupe the runs' CSVs across manifests
+        # first, so each is still parsed once
+        manifest_runs = [_read_json(m).get("runs", []) for m in man_paths]
+        files = list(dict.fromkeys(_run_files(r) for runs in manifest_runs for r in runs))
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            chunk = max(1, len(files) // (4 * args.workers))
+            stats = dict(zip(files, ex.map(_run_stats, files, chunksize=chunk), strict=True))
+        frames = [
+            _theory_frame(runs, [stats[_run_files(r)] for r in runs]) for runs in manifest_runs
+        ]
+    else:
+        frames = [aggregate_theory(m) for m in man_paths]
     df_runs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     df_runs.to_csv(os.path.join(args.out_dir, "runs_flat.csv"), index=False)
 
@@ -3,10 +3,13 @@ from __future__ import annotations
 import math
 import random
 
+import numpy as np
+
 from p2p.agents.prosumer import Prosumer
-from p2p.env.devices import Battery, generate_ev_charging_profile_kw
+from p2p.env.devices import Battery, generate_ev_charging_profile_kw, step_batch
 from p2p.env.profiles import (
     household_load_profile_kwh,
+    population_profiles_kwh,
     pv_profile_kwh,
     sample_pv_nameplate_kw,
 )
@@ -74,3 +77,52 @@ def test_prosumer_energy_balance_no_battery() -> None:
     assert abs(n1 + 0.3) < 1e-9
     q1 = pr.make_quote(1)
     assert q1 is not None and q1[2] == "sell" and abs(q1[1] - 0.3) < 1e-9
+
+
+def test_battery_step_batch_matches_scalar_step() -> None:
+    rng = random.Random(3)  # noqa: S311
+    bats = [
+        Battery(
+            capacity_kwh=rng.uniform(5.0, 15.0),
+            power_kw=rng.uniform(2.0, 7.0),
+            eta_rt=rng.uniform(0.8, 0.95),
+            soc=rng.uniform(0.1, 1.0),
+        )
+        for _ in range(50)
+    ]
+    charge = [rng.choice([0.0, rng.uniform(0.0, 10.0)]) for _ in bats]
+    discharge = [rng.choice([0.0, rng.uniform(0.0, 10.0)]) for _ in bats]
+    out = step_batch(
+        np.array([b.soc for b in bats]),
+        np.array([b.capacity_kwh for b in bats]),
+        np.array([b.power_kw for b in bats]),
+        np.array([b.eta_chg for b in bats]),
+        np.array([b.eta_dis for b in bats]),
+        np.array([b.min_soc for b in bats]),
+        np.array(charge),
+        np.array(discharge),
+    )
+    for k, (b, c, d) in enumerate(zip(bats, charge, discharge, strict=True)):
+        ref = b.step(charge_kw=c, discharge_kw=d)
+        for key, val in ref.items():
+            assert out[key][k] == val
+
+
+def test_population_profiles_shapes_and_caps() -> None:
+    load, pv, nameplate = population_profiles_kwh(40, rng=np.random.default_rng(0))
+    assert load.shape == pv.shape == (40, 288) and nameplate.shape == (40,)
+    # Per-household daily load is the base scaled by a lognormal factor (sigma 0.2)
+    assert np.all((load.sum(axis=1) > 10.0) & (load.sum(axis=1) < 90.0))
+    # PV is non-negative and clipped at each household's nameplate per 5-minute interval
+    assert np.all(pv >= 0.0)
+    assert np.all(pv <= nameplate[:, None] * (5 / 60.0) + 1e-12)
+
+
+def test_profiles_accept_numpy_generator() -> None:
+    nameplate = sample_pv_nameplate_kw(rng=np.random.default_rng(1))
+    pv = pv_profile_kwh(nameplate_kw=nameplate, rng=np.random.default_rng(2))
+    again = pv_profile_kwh(nameplate_kw=nameplate, rng=np.random.default_rng(2))
+    assert pv == again and len(pv) == 288
+    assert max(pv) <= nameplate * (5 / 60.0) + 1e-12 and min(pv) >= 0.0
+    load = household_load_profile_kwh(rng=np.random.default_rng(3))
+    assert len(load) == 288 and 10.0 < sum(load) < 90.0
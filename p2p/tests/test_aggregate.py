@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from p2p.sim.aggregate import _interval_means, pareto_frontier
+
+
+def test_pareto_frontier_ties_and_duplicates() -> None:
+    df = pd.DataFrame(
+        {
+            "w_hat_mean": [0.9, 0.9, 0.8, 0.9, 0.5, 1.0, 0.7],
+            "wall_ms_mean": [2.0, 2.0, 2.0, 3.0, 1.0, 5.0, 4.0],
+        }
+    )
+    # Duplicates (0, 1) both stay; same-cost lower welfare (2), equal welfare at higher
+    # cost (3) and strictly worse (6) are dominated.
+    assert list(pareto_frontier(df).index) == [0, 1, 4, 5]
+
+
+def test_interval_means_reread_after_rewrite(tmp_path: Path) -> None:
+    # exp_runner rewrites per-cell CSVs in place; the cached means must follow the file
+    csv = tmp_path / "intervals.csv"
+    csv.write_text("W,W_hat\n1.0,0.5\n3.0,0.7\n")
+    assert _interval_means(str(csv)) == (0.6, 2.0)
+    csv.write_text("W,W_hat\n5.0,0.9\n7.0,0.9\n")
+    st = csv.stat()
+    os.utime(csv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert _interval_means(str(csv)) == (0.9, 6.0)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import numpy as np
+
+from p2p.agents import _fastpath
+from p2p.agents.learner import NoRegretLearner
 from p2p.agents.optimizer import Optimizer
+from p2p.agents.prosumer import Decision
 from p2p.agents.satisficer import Satisficer
-from p2p.market.order_book import OrderBook
+from p2p.market.order_book import BookSnapshot, OrderBook
 
 
 def _snapshot(ob: OrderBook) -> dict:
@@ -10,6 +15,16 @@ def _snapshot(ob: OrderBook) -> dict:
     return {"bids": bids, "asks": asks}
 
 
+def _band_scan(prices: np.ndarray, q_price: float, band: float, is_buy: bool) -> int:
+    # Reference linear scan for band_search: first offer inside the tolerance window
+    lo = q_price * (1.0 - band) if is_buy else q_price
+    hi = q_price if is_buy else q_price * (1.0 + band)
+    for i in range(prices.size):
+        if lo <= prices[i] <= hi:
+            return i
+    return -1
+
+
 def test_satisficer_band_accepts_within_tau_and_stops() -> None:
     # Buyer with quote price 20; band 5% => accept if ask within [19,21]
     s = Satisficer(agent_id="a1")
@@ -21,7 +36,20 @@ def test_satisficer_band_accepts_within_tau_and_stops() -> None:
     a2, _ = ob.submit(agent_id="s2", side="sell", price_cperkwh=19.5, qty_kwh=1.0)
     act = s.decide(_snapshot(ob), t=0)
     # Best-price first: accept a2 immediately and stop after seeing 1 offer
-    assert act["type"] == "accept" and act["order_id"] == a2 and act["offers_seen"] == 1
+    assert act.type == "accept" and act.order_id == a2 and act.offers_seen == 1
+
+
+def test_satisficer_band_seller_reads_book_columns() -> None:
+    # Seller quoting 20 with a 5% band accepts bids in [20, 21]; bids are best (highest) first
+    s = Satisficer(agent_id="a1s")
+    s.make_quote = lambda t: (20.0, 1.0, "sell")  # type: ignore[method-assign]
+    ob = OrderBook()
+    ob.submit(agent_id="b1", side="buy", price_cperkwh=23.0, qty_kwh=1.0)
+    b2, _ = ob.submit(agent_id="b2", side="buy", price_cperkwh=20.5, qty_kwh=0.4)
+    ob.submit(agent_id="b3", side="buy", price_cperkwh=19.0, qty_kwh=1.0)
+    act = s.decide(BookSnapshot(ob.bids, ob.asks, ob.columns), t=0)
+    assert act.type == "accept" and act.order_id == b2 and act.offers_seen == 2
+    assert act.qty_kwh == 0.4 and act.price == 20.5
 
 
 def test_satisficer_k_search_stops_at_k_and_picks_best_among_seen() -> None:
@@ -34,7 +62,7 @@ def test_satisficer_k_search_stops_at_k_and_picks_best_among_seen() -> None:
     a3, _ = ob.submit(agent_id="s3", side="sell", price_cperkwh=10.0, qty_kwh=1.0)
     act = s.decide(_snapshot(ob), t=0)
     # With price-time order, the first two seen are 10 and 25; best is 10 (a3)
-    assert act["type"] == "accept" and act["order_id"] == a3 and act["offers_seen"] == 2
+    assert act.type == "accept" and act.order_id == a3 and act.offers_seen == 2
 
 
 def test_optimizer_weakly_dominates_satisficer_price_choice() -> None:
@@ -50,5 +78,48 @@ def test_optimizer_weakly_dominates_satisficer_price_choice() -> None:
     act_s = s.decide(snap, t=0)
     act_o = o.decide(snap, t=0)
     # Optimizer price should be <= satisficer price (weak dominance)
-    assert act_s["type"] == "accept" and act_o["type"] == "accept"
-    assert act_o["price"] <= act_s["price"]
+    assert act_s.type == "accept" and act_o.type == "accept"
+    assert act_o.price is not None and act_s.price is not None
+    assert act_o.price <= act_s.price
+
+
+def test_band_search_matches_linear_scan() -> None:
+    # Binary search on the best-first side must agree with the plain linear scan
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        asks = np.sort(np.round(rng.uniform(10.0, 20.0, rng.integers(0, 20)), 1))
+        q_price = float(rng.uniform(8.0, 22.0))
+        for prices, is_buy in ((asks, True), (asks[::-1].copy(), False)):
+            expected = _band_scan(prices, q_price, 0.05, is_buy)
+            assert _fastpath.band_search(prices, q_price, 0.05, is_buy) == expected
+
+
+def test_learner_accepts_zero_price_maker() -> None:
+    # A 0.0 maker price is a valid price, not a missing field
+    ob = OrderBook()
+    a1, _ = ob.submit(agent_id="s1", side="sell", price_cperkwh=0.0, qty_kwh=1.0)
+    lr = NoRegretLearner(agent_id="l0", seed=0)
+    lr.make_quote = lambda t: (16.0, 0.5, "buy")  # type: ignore[method-assign]
+    act = lr.decide(_snapshot(ob), t=0)
+    assert act.type == "accept" and act.order_id == a1 and act.price == 0.0
+
+
+def test_decision_round_trips_legacy_dict() -> None:
+    d = Decision("accept", order_id=3, qty_kwh=0.5, price=12.0, side="buy", offers_seen=2)
+    assert Decision.of(d.as_dict()) == d
+    assert Decision.of({"type": "post"}) == Decision("post")
+    assert Decision("post").price is None and Decision.of(None) is None
+
+
+def test_plain_dict_snapshot_is_read_fresh() -> None:
+    # A caller may edit and reuse its own dict between decisions; agents must not cache in it
+    ob = OrderBook()
+    a1, _ = ob.submit(agent_id="s1", side="sell", price_cperkwh=15.0, qty_kwh=1.0)
+    a2, _ = ob.submit(agent_id="s2", side="sell", price_cperkwh=14.0, qty_kwh=1.0)
+    o = Optimizer(agent_id="o1")
+    o.make_quote = lambda t: (16.0, 0.5, "buy")  # type: ignore[method-assign]
+    snap = _snapshot(ob)
+    assert o.decide(snap, t=0).order_id == a2
+    snap["asks"] = [x for x in snap["asks"] if x.order_id != a2]
+    assert o.decide(snap, t=0).order_id == a1
+    assert set(snap) == {"bids", "asks"}
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from p2p.market.order_book import OrderBook
+import random
+
+import numpy as np
+import pytest
+
+from p2p.agents.prosumer import Prosumer, Side
+from p2p.agents.satisficer import Satisficer
+from p2p.market.clearing import _batch_match, step_interval, step_interval_call
+from p2p.market.order_book import Order, OrderBook, order_columns
 
 
 def test_crossing_maker_price_buy_takes_resting_ask() -> None:
@@ -81,6 +89,9 @@ def test_conservation_of_energy_traded() -> None:
     _, trades = ob.submit(agent_id="b1", side="buy", price_cperkwh=20.0, qty_kwh=0.7)
     traded = sum(t.qty_kwh for t in trades)
     assert abs(traded - 0.7) < 1e-9
+    # The book's running total accumulates the same fills, in the same order
+    assert ob.traded_kwh == traded
+    assert ob.clear_trades() == trades and ob.traded_kwh == 0.0
 
 
 def test_fifo_within_equal_price_levels() -> None:
@@ -111,3 +122,142 @@ def test_tick_rounding_and_crossing() -> None:
     assert len(trades) == 1
     t = trades[0]
     assert t.maker_order_id == a_id and t.price_cperkwh == 15.1 and abs(t.qty_kwh - 0.2) < 1e-9
+
+
+def test_cached_columns_track_book_mutations() -> None:
+    ob = OrderBook()
+    rng = random.Random(7)  # noqa: S311
+    for i in range(300):
+        side: Side = "buy" if rng.random() < 0.5 else "sell"
+        ob.submit(
+            agent_id=f"a{i}",
+            side=side,
+            price_cperkwh=rng.uniform(12.0, 20.0),
+            qty_kwh=rng.uniform(0.1, 1.0),
+        )
+        # Columns are served from the cache and must match a fresh extraction
+        for name, orders in zip(("bids", "asks"), ob.snapshot(), strict=True):
+            cols, fresh = ob.columns(name), order_columns(orders)
+            assert np.array_equal(cols.prices, fresh.prices)
+            assert np.array_equal(cols.qtys, fresh.qtys)
+            assert np.array_equal(cols.oids, fresh.oids)
+
+
+def test_order_columns_legacy_tuples_match_orders() -> None:
+    ob = OrderBook()
+    ob.submit(agent_id="s1", side="sell", price_cperkwh=0.0, qty_kwh=0.5)
+    ob.submit(agent_id="s2", side="sell", price_cperkwh=14.0, qty_kwh=1.5)
+    asks = ob.snapshot()[1]
+    legacy = [(o.price_cperkwh, o.qty_kwh, o.side, o.order_id) for o in asks]
+    for a, b in zip(order_columns(asks), order_columns(legacy), strict=True):
+        assert np.array_equal(a, b)
+    assert order_columns(asks).prices[0] == 0.0
+
+
+def test_batch_match_price_time_priority_with_feeder_cap() -> None:
+    bids = [
+        Order(1, 20.0, 1.0, "buy", "b1", 1),
+        Order(2, 22.0, 0.5, "buy", "b2", 2),
+    ]
+    asks = [
+        Order(3, 18.0, 0.4, "sell", "s1", 3),
+        Order(4, 15.0, 0.3, "sell", "s2", 4),
+    ]
+    # 7.2 kW over a 5-minute interval caps the batch at 0.6 kWh
+    trades, res_b, res_a, traded = _batch_match(bids, asks, feeder_limit_kw=7.2, step_min=5)
+    fills = [(tr.buy_agent, tr.sell_agent, tr.price_cperkwh) for tr in trades]
+    assert fills == [("b2", "s2", 15.0), ("b2", "s1", 18.0), ("b1", "s1", 18.0)]
+    assert np.allclose([tr.qty_kwh for tr in trades], [0.3, 0.2, 0.1])
+    assert traded == sum(tr.qty_kwh for tr in trades)
+    assert [o.order_id for o in res_b] == [1] and np.isclose(res_b[0].qty_kwh, 0.9)
+    assert [o.order_id for o in res_a] == [3] and np.isclose(res_a[0].qty_kwh, 0.1)
+    # Inputs are left as posted
+    assert [o.qty_kwh for o in bids] == [1.0, 0.5] and [o.qty_kwh for o in asks] == [0.4, 0.3]
+
+
+def test_record_history_off_keeps_clearing_outcome() -> None:
+    for step in (step_interval, step_interval_call):
+        results = []
+        for record in (True, False):
+            agents: list[Prosumer] = [Satisficer(agent_id=f"h{i}", seed=i) for i in range(8)]
+            ob = OrderBook()
+            results.append([step(t, agents, ob, record_history=record) for t in range(100, 110)])
+        for full, lean in zip(*results, strict=True):
+            assert (full.trades, full.traded_kwh) == (lean.trades, lean.traded_kwh)
+            assert lean.posted_bids == lean.posted_asks == lean.book_bids_start == []
+        assert any(r.posted_bids or r.posted_asks for r in results[0])
+
+
+def test_result_columns_match_start_book_plus_posts() -> None:
+    for step in (step_interval, step_interval_call):
+        agents: list[Prosumer] = [Satisficer(agent_id=f"h{i}", seed=i) for i in range(8)]
+        ob = OrderBook()
+        for t in range(100, 110):
+            r = step(t, agents, ob)
+            for cols, orders in (
+                (r.bid_columns, r.book_bids_start + r.posted_bids),
+                (r.ask_columns, r.book_asks_start + r.posted_asks),
+            ):
+                ref = order_columns(orders)
+                assert np.array_equal(cols.prices, ref.prices)
+                assert np.array_equal(cols.qtys, ref.qtys)
+
+
+def test_resting_orders_are_replaced_not_mutated() -> None:
+    ob = OrderBook()
+    ob.submit(agent_id="s1", side="sell", price_cperkwh=15.0, qty_kwh=1.0)
+    ob.submit(agent_id="s2", side="sell", price_cperkwh=16.0, qty_kwh=1.0)
+    before = list(ob.asks)
+    ob.submit(agent_id="b1", side="buy", price_cperkwh=16.0, qty_kwh=1.5)
+    ob.modify(ob.asks[0].order_id, new_qty_kwh=0.2)
+    # Earlier views keep the quantities they were taken with
+    assert [o.qty_kwh for o in before] == [1.0, 1.0]
+    assert [(o.agent_id, o.qty_kwh) for o in ob.asks] == [("s2", 0.2)]
+
+
+def test_snapshot_memoized_until_book_changes() -> None:
+    ob = OrderBook()
+    ob.submit(agent_id="s1", side="sell", price_cperkwh=15.0, qty_kwh=1.0)
+    first = ob.snapshot()
+    assert ob.snapshot()[1] is first[1]
+    v = ob.version
+    assert not ob.cancel(999) and ob.version == v
+    ob.submit(agent_id="b1", side="buy", price_cperkwh=10.0, qty_kwh=1.0)
+    assert ob.version > v
+    bids, asks = ob.snapshot()
+    assert [o.agent_id for o in bids] == ["b1"] and first[0] == []
+    assert [o.agent_id for o in asks] == ["s1"]
+    # Replacing the book invalidates the snapshot and the cached columns too
+    ob.columns("asks")
+    v = ob.version
+    ob.set_resting([], [Order(7, 17.0, 2.0, "sell", "s7", 9)])
+    assert ob.version > v and [o.agent_id for o in ob.snapshot()[1]] == ["s7"]
+    assert ob.columns("asks").prices.tolist() == [17.0]
+
+
+def test_resting_sides_are_read_only() -> None:
+    # The public sides can't be edited behind the snapshot/columns caches
+    ob = OrderBook()
+    ob.submit(agent_id="b1", side="buy", price_cperkwh=10.0, qty_kwh=1.0)
+    bids = ob.bids
+    assert ob.columns("bids").prices.tolist() == [10.0]
+    with pytest.raises(AttributeError):
+        bids.clear()  # type: ignore[attr-defined]
+    with pytest.raises(TypeError):
+        bids[0] = bids[0]  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        ob.bids = bids  # type: ignore[misc]
+    assert ob.best_bid() == 10.0 and [o.agent_id for o in ob.snapshot()[0]] == ["b1"]
+    # Views follow the book; its own updates go through the caches
+    ob.cancel(bids[0].order_id)
+    assert len(bids) == 0 and ob.columns("bids").prices.size == 0
+
+
+def test_arrivals_continue_after_given_orders() -> None:
+    # Orders handed to the book keep FIFO priority over later arrivals at the same price
+    ob = OrderBook()
+    ob.set_resting([], [Order(50, 15.0, 1.0, "sell", "s0", 40)])
+    assert ob.next_arrival_seq() == 41
+    ob.set_resting([], [Order(51, 15.0, 1.0, "sell", "s1", 60)])
+    ob.submit(agent_id="s2", side="sell", price_cperkwh=15.0, qty_kwh=1.0)
+    assert [o.agent_id for o in ob.asks] == ["s1", "s2"] and ob.asks[1].arrival_seq == 61
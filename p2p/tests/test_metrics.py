@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from p2p.market.order_book import Order, OrderBook
-from p2p.sim.metrics import compute_quote_welfare, planner_bound_quote_welfare
+import numpy as np
+
+from p2p.market.order_book import Order, OrderBook, OrderColumns
+from p2p.sim.metrics import (
+    compute_quote_welfare,
+    planner_bound_from_columns,
+    planner_bound_quote_welfare,
+)
 
 
 def test_planner_bound_ge_realized() -> None:
@@ -15,33 +21,10 @@ def test_planner_bound_ge_realized() -> None:
     # Snapshot book before clearing trades (the last submit may have matched;
     # so rebuild a fresh book)
     # Build a fresh OB without matching to compute bound
-    bids = [
-        Order(
-            order_id=1,
-            price_cperkwh=16.0,
-            qty_kwh=0.6,
-            side="buy",
-            agent_id="b1",
-            arrival_seq=0,
-        )
-    ]
+    bids = [Order(1, 16.0, 0.6, "buy", "b1", 0)]
     asks = [
-        Order(
-            order_id=2,
-            price_cperkwh=15.0,
-            qty_kwh=0.5,
-            side="sell",
-            agent_id="s1",
-            arrival_seq=0,
-        ),
-        Order(
-            order_id=3,
-            price_cperkwh=16.0,
-            qty_kwh=0.5,
-            side="sell",
-            agent_id="s2",
-            arrival_seq=0,
-        ),
+        Order(2, 15.0, 0.5, "sell", "s1", 0),
+        Order(3, 16.0, 0.5, "sell", "s2", 0),
     ]
     w_bound, _ = planner_bound_quote_welfare(bids=bids, asks=asks)
 
@@ -67,25 +50,33 @@ def test_planner_bound_ge_realized() -> None:
 
 
 def test_planner_equal_on_simple_cross() -> None:
-    bids = [
-        Order(
-            order_id=1,
-            price_cperkwh=20.0,
-            qty_kwh=1.0,
-            side="buy",
-            agent_id="b",
-            arrival_seq=0,
-        )
-    ]
-    asks = [
-        Order(
-            order_id=2,
-            price_cperkwh=10.0,
-            qty_kwh=1.0,
-            side="sell",
-            agent_id="s",
-            arrival_seq=0,
-        )
-    ]
+    bids = [Order(1, 20.0, 1.0, "buy", "b", 0)]
+    asks = [Order(2, 10.0, 1.0, "sell", "s", 0)]
     w_bound, traded = planner_bound_quote_welfare(bids=bids, asks=asks)
     assert traded == 1.0 and abs(w_bound - (20.0 - 10.0) * 1.0) < 1e-12
+
+
+def test_planner_bound_respects_feeder_cap() -> None:
+    bids = [Order(1, 20.0, 1.0, "buy", "b1", 0), Order(2, 20.0, 1.0, "buy", "b2", 1)]
+    asks = [Order(3, 12.0, 2.0, "sell", "s2", 2), Order(4, 10.0, 0.5, "sell", "s1", 3)]
+    # 12 kW over a 5-minute interval caps the bound at 1 kWh: 0.5 @ 10c, then 0.5 @ 12c
+    w_bound, traded = planner_bound_quote_welfare(bids=bids, asks=asks, feeder_limit_kw=12.0)
+    assert abs(traded - 1.0) < 1e-12 and abs(w_bound - (0.5 * 10.0 + 0.5 * 8.0)) < 1e-12
+
+
+def test_planner_bound_from_unsorted_columns_matches_orders() -> None:
+    # Raw arrays in arrival order (not best-first): the column path sorts them itself
+    bids = OrderColumns(np.array([14.0, 20.0, 16.0]), np.array([0.6, 0.3, 0.6]), np.arange(3))
+    asks = OrderColumns(np.array([16.0, 15.0]), np.array([0.5, 0.5]), np.arange(3, 5))
+    w_bound, traded = planner_bound_from_columns(bids=bids, asks=asks)
+    # 0.3 @ 20 vs 15, 0.2 @ 16 vs 15, 0.4 @ 16 vs 16
+    assert abs(traded - 0.9) < 1e-12 and abs(w_bound - (0.3 * 5.0 + 0.2 * 1.0)) < 1e-12
+    as_orders = planner_bound_quote_welfare(
+        bids=[
+            Order(0, 14.0, 0.6, "buy", "b0", 0),
+            Order(1, 20.0, 0.3, "buy", "b1", 1),
+            Order(2, 16.0, 0.6, "buy", "b2", 2),
+        ],
+        asks=[Order(3, 16.0, 0.5, "sell", "s0", 3), Order(4, 15.0, 0.5, "sell", "s1", 4)],
+    )
+    assert as_orders == (w_bound, traded)
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+from importlib.util import find_spec
+from typing import Any
+
+import pytest
+
 from p2p.sim.run import run_smoke
 
 
-def test_smoke_run_basic() -> None:
-    summary = run_smoke(intervals=2, n_agents=4)
-    assert summary.intervals == 2
-    assert summary.agents == 4
+@pytest.mark.parametrize(("intervals", "n_agents"), [(2, 4), (10, 16), (100, 64)])
+def test_smoke_run_basic(intervals: int, n_agents: int) -> None:
+    summary = run_smoke(intervals=intervals, n_agents=n_agents)
+    assert summary.intervals == intervals
+    assert summary.agents == n_agents
     # Expect some posted volume in the no-op market
     assert summary.posted_volume_kwh > 0.0
+    assert summary.traded_volume_kwh <= summary.posted_volume_kwh
+
 
+@pytest.mark.skipif(find_spec("pytest_benchmark") is None, reason="needs pytest-benchmark")
+def test_smoke_run_benchmark(benchmark: Any) -> None:
+    # Timing gate for the event loop; compare against a saved run (see README)
+    summary = benchmark.pedantic(
+        run_smoke, kwargs={"intervals": 10, "n_agents": 16}, rounds=20, warmup_rounds=3
+    )
+    assert summary.intervals == 10 and summary.agents == 16
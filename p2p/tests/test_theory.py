@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+from p2p.sim.theory import _read_json, aggregate_theory
+
+
+def test_manifest_with_non_finite_feeder_cap_is_read(tmp_path: Path) -> None:
+    # exp_runner writes an uncapped feeder as Infinity (json.dump's allow_nan default)
+    csv = tmp_path / "intervals.csv"
+    csv.write_text("W,W_hat\n1.0,0.5\n3.0,0.7\n")
+    run = {"N": 4, "agent": "optimizer", "mode": "none", "tau": None, "K": None, "seed": 0}
+    manifest = tmp_path / "manifest.json"
+    with open(manifest, "w") as f:
+        json.dump({"feeder_cap_kw": float("inf"), "runs": [{**run, "interval_csv": str(csv)}]}, f)
+    assert math.isinf(_read_json(str(manifest))["feeder_cap_kw"])
+    df = aggregate_theory(str(manifest))
+    assert len(df) == 1 and abs(df["w_hat"].iloc[0] - 0.6) < 1e-12